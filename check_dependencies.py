@@ -24,15 +24,14 @@ def is_package_installed(package_name: str) -> bool:
     Returns:
         True if installed, False otherwise
     """
-    # Handle package name variations
+    # Handle package name variations (distribution name -> import name)
     import_name_map = {
-        'fastapi': 'fastapi',
-        'uvicorn': 'uvicorn',
-        'requests': 'requests',
-        'pydantic': 'pydantic'
+        'python-dotenv': 'dotenv',
+        'python-multipart': 'multipart',
+        'python-telegram-bot': 'telegram'
     }
 
-    import_name = import_name_map.get(package_name, package_name)
+    import_name = import_name_map.get(package_name, package_name.replace('-', '_'))
 
     spec = importlib.util.find_spec(import_name)
     return spec is not None
@@ -9,20 +9,22 @@ Communicates with middleware service.
 NO CEREBRUM IMPORTS. NO SHARED CODE.
 """
 
+import os
 import sys
 
 # Windows-safe check and cross marks
 CHECK = "[OK]"
 CROSS = "[X]"
 
-# Check dependencies on startup
-try:
-    from check_dependencies import check_and_install_dependencies
-    if not check_and_install_dependencies(auto_install=True):
-        print(f"{CROSS} Failed to install dependencies. Exiting.")
-        sys.exit(1)
-except ImportError:
-    print("Warning: Dependency checker not available")
+# Check dependencies on startup (set SKIP_DEP_CHECK=1 to skip)
+if os.getenv('SKIP_DEP_CHECK') != '1':
+    try:
+        from check_dependencies import check_and_install_dependencies
+        if not check_and_install_dependencies(auto_install=True):
+            print(f"{CROSS} Failed to install dependencies. Exiting.")
+            sys.exit(1)
+    except ImportError:
+        print("Warning: Dependency checker not available")
 
 import argparse
 import json
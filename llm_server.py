@@ -39,9 +39,13 @@ from port_utils import find_free_port
 # Load environment variables from .env file
 load_dotenv()
 
-# Load configuration
-with open('config.json', 'r') as f:
-    config = json.load(f)
+# Load configuration (the launchers hand over their already-parsed copy)
+config_blob = os.environ.get('LLM_TRAINER_CONFIG_BLOB')
+if config_blob:
+    config = json.loads(config_blob)
+else:
+    with open('config.json', 'r') as f:
+        config = json.load(f)
 
 # Override API key from environment if available (more secure)
 if os.getenv('OPENROUTER_API_KEY'):
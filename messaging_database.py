@@ -12,25 +12,43 @@ Manages user data for both SMS and Telegram:
 
 import sqlite3
 import json
+import threading
 from datetime import datetime
 from typing import Optional, List, Dict
 from pathlib import Path
 import logging
 
+from cachetools import TTLCache
+
 logger = logging.getLogger(__name__)
 
 class MessagingDatabase:
     """Manages user data and conversation history for SMS and Telegram"""
 
-    def __init__(self, db_path: str = "messaging_users.db"):
+    def __init__(self, db_path: str = "messaging_users.db", cache_users: bool = True):
         """
         Initialize database connection
 
         Args:
             db_path: Path to SQLite database file
+            cache_users: Cache user rows in this process. Pass False when
+                other processes also write users, since they cannot
+                invalidate this process's copies.
         """
         self.db_path = db_path
         self.conn = None
+
+        # Every write takes this lock, so one thread's commit or rollback on
+        # the shared connection never covers another thread's statements
+        self._write_lock = threading.RLock()
+
+        # Recently looked-up users by user_id (the primary key, so one row per
+        # id across platforms), kept in sync by create_user/update_user_*
+        self._user_cache: Optional[TTLCache] = (
+            TTLCache(maxsize=10_000, ttl=300) if cache_users else None
+        )
+        self._user_cache_lock = threading.RLock()
+
         self._init_db()
 
     def _init_db(self):
@@ -91,23 +109,25 @@ class MessagingDatabase:
         Returns:
             User dict or None if not found
         """
-        cursor = self.conn.cursor()
-
-        if platform:
-            cursor.execute(
-                "SELECT * FROM users WHERE user_id = ? AND platform = ?",
-                (user_id, platform)
-            )
-        else:
-            cursor.execute(
-                "SELECT * FROM users WHERE user_id = ?",
-                (user_id,)
-            )
+        cached = self._cached_user(user_id)
+        if cached:
+            if platform and cached['platform'] != platform:
+                return None
+            return dict(cached)
 
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT * FROM users WHERE user_id = ?",
+            (user_id,)
+        )
         row = cursor.fetchone()
 
         if row:
-            return dict(row)
+            user = dict(row)
+            self._cache_user(user)
+            if platform and user['platform'] != platform:
+                return None
+            return dict(user)
         return None
 
     def create_user(
@@ -132,28 +152,30 @@ class MessagingDatabase:
             Created user dict
         """
         now = datetime.now().isoformat()
-        cursor = self.conn.cursor()
+        with self._write_lock, self.conn:
+            cursor = self.conn.cursor()
 
-        cursor.execute(
-            """
-            INSERT INTO users (user_id, platform, name, username, ai_backend, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (user_id, platform, name, username, ai_backend, now, now)
-        )
+            cursor.execute(
+                """
+                INSERT INTO users (user_id, platform, name, username, ai_backend, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (user_id, platform, name, username, ai_backend, now, now)
+            )
 
-        self.conn.commit()
-        logger.info(f"Created {platform} user: {user_id} (name: {name}, AI: {ai_backend})")
+            user = {
+                "user_id": user_id,
+                "platform": platform,
+                "name": name,
+                "username": username,
+                "ai_backend": ai_backend,
+                "created_at": now,
+                "updated_at": now
+            }
+            self._cache_user(user)
 
-        return {
-            "user_id": user_id,
-            "platform": platform,
-            "name": name,
-            "username": username,
-            "ai_backend": ai_backend,
-            "created_at": now,
-            "updated_at": now
-        }
+        logger.info(f"Created {platform} user: {user_id} (name: {name}, AI: {ai_backend})")
+        return dict(user)
 
     def update_user_name(self, user_id: str, name: str, platform: str = None) -> bool:
         """
@@ -167,29 +189,32 @@ class MessagingDatabase:
         Returns:
             True if updated, False if user not found
         """
-        cursor = self.conn.cursor()
-        now = datetime.now().isoformat()
-
-        if platform:
-            cursor.execute(
-                """
-                UPDATE users
-                SET name = ?, updated_at = ?
-                WHERE user_id = ? AND platform = ?
-                """,
-                (name, now, user_id, platform)
-            )
-        else:
-            cursor.execute(
-                """
-                UPDATE users
-                SET name = ?, updated_at = ?
-                WHERE user_id = ?
-                """,
-                (name, now, user_id)
-            )
-
-        self.conn.commit()
+        with self._write_lock, self.conn:
+            cursor = self.conn.cursor()
+            now = datetime.now().isoformat()
+
+            if platform:
+                cursor.execute(
+                    """
+                    UPDATE users
+                    SET name = ?, updated_at = ?
+                    WHERE user_id = ? AND platform = ?
+                    """,
+                    (name, now, user_id, platform)
+                )
+            else:
+                cursor.execute(
+                    """
+                    UPDATE users
+                    SET name = ?, updated_at = ?
+                    WHERE user_id = ?
+                    """,
+                    (name, now, user_id)
+                )
+
+            # Patched under the write lock so concurrent updates land in order
+            if cursor.rowcount > 0:
+                self._update_cached_user(user_id, name=name, updated_at=now)
 
         if cursor.rowcount > 0:
             logger.info(f"Updated name for {user_id}: {name}")
@@ -208,35 +233,60 @@ class MessagingDatabase:
         Returns:
             True if updated, False if user not found
         """
-        cursor = self.conn.cursor()
-        now = datetime.now().isoformat()
-
-        if platform:
-            cursor.execute(
-                """
-                UPDATE users
-                SET ai_backend = ?, updated_at = ?
-                WHERE user_id = ? AND platform = ?
-                """,
-                (ai_backend, now, user_id, platform)
-            )
-        else:
-            cursor.execute(
-                """
-                UPDATE users
-                SET ai_backend = ?, updated_at = ?
-                WHERE user_id = ?
-                """,
-                (ai_backend, now, user_id)
-            )
-
-        self.conn.commit()
+        with self._write_lock, self.conn:
+            cursor = self.conn.cursor()
+            now = datetime.now().isoformat()
+
+            if platform:
+                cursor.execute(
+                    """
+                    UPDATE users
+                    SET ai_backend = ?, updated_at = ?
+                    WHERE user_id = ? AND platform = ?
+                    """,
+                    (ai_backend, now, user_id, platform)
+                )
+            else:
+                cursor.execute(
+                    """
+                    UPDATE users
+                    SET ai_backend = ?, updated_at = ?
+                    WHERE user_id = ?
+                    """,
+                    (ai_backend, now, user_id)
+                )
+
+            if cursor.rowcount > 0:
+                self._update_cached_user(user_id, ai_backend=ai_backend, updated_at=now)
 
         if cursor.rowcount > 0:
             logger.info(f"Updated AI backend for {user_id}: {ai_backend}")
             return True
         return False
 
+    def _cached_user(self, user_id: str) -> Optional[Dict]:
+        """Cached row for user_id, or None if absent or caching is off"""
+        if self._user_cache is None:
+            return None
+        with self._user_cache_lock:
+            return self._user_cache.get(user_id)
+
+    def _cache_user(self, user: Dict):
+        """Store a user row in the cache (no-op when caching is off)"""
+        if self._user_cache is None:
+            return
+        with self._user_cache_lock:
+            self._user_cache[user['user_id']] = user
+
+    def _update_cached_user(self, user_id: str, **fields):
+        """Apply a successful UPDATE to the cached copy of the user, if any"""
+        if self._user_cache is None:
+            return
+        with self._user_cache_lock:
+            cached = self._user_cache.get(user_id)
+            if cached:
+                self._user_cache[user_id] = {**cached, **fields}
+
     def add_conversation_message(
         self,
         user_id: str,
@@ -256,18 +306,18 @@ class MessagingDatabase:
         Returns:
             Message ID
         """
-        cursor = self.conn.cursor()
         timestamp = datetime.now().isoformat()
 
-        cursor.execute(
-            """
-            INSERT INTO conversations (user_id, platform, role, message, timestamp)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (user_id, platform, role, message, timestamp)
-        )
+        with self._write_lock, self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO conversations (user_id, platform, role, message, timestamp)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (user_id, platform, role, message, timestamp)
+            )
 
-        self.conn.commit()
         message_id = cursor.lastrowid
 
         logger.debug(f"Added {role} message for {user_id} ({platform}): {message[:50]}...")
@@ -340,7 +390,63 @@ class MessagingDatabase:
             List of dicts with 'user' and 'assistant' keys
         """
         messages = self.get_conversation_history(user_id, platform, limit)
+        return self._format_exchanges(messages)
 
+    def append_user_and_fetch_history(
+        self,
+        user_id: str,
+        platform: str,
+        message: str,
+        limit: int = 5
+    ) -> List[Dict[str, str]]:
+        """
+        Store a user message and return the history that preceded it
+
+        Both statements run in one transaction, so a user turn costs a
+        single commit instead of a read plus a separate write.
+
+        Args:
+            user_id: User identifier
+            platform: 'sms' or 'telegram'
+            message: The user's new message
+            limit: Max number of recent exchanges
+
+        Returns:
+            Prior exchanges formatted for the LLM API (excluding this message)
+        """
+        timestamp = datetime.now().isoformat()
+
+        with self._write_lock, self.conn:
+            cursor = self.conn.cursor()
+            # sqlite3 only opens a transaction implicitly at the INSERT, so
+            # begin explicitly to put the SELECT inside it too
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(
+                """
+                SELECT role, message, timestamp
+                FROM conversations
+                WHERE user_id = ? AND platform = ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+                """,
+                (user_id, platform, limit * 2)
+            )
+            rows = cursor.fetchall()
+
+            cursor.execute(
+                """
+                INSERT INTO conversations (user_id, platform, role, message, timestamp)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (user_id, platform, 'user', message, timestamp)
+            )
+
+        logger.debug(f"Added user message for {user_id} ({platform}): {message[:50]}...")
+        return self._format_exchanges([dict(row) for row in reversed(rows)])
+
+    @staticmethod
+    def _format_exchanges(messages: List[Dict]) -> List[Dict[str, str]]:
+        """Pair chronological user/assistant messages into LLM exchanges"""
         formatted = []
         current_exchange = {}
 
@@ -365,20 +471,20 @@ class MessagingDatabase:
         Returns:
             Number of messages deleted
         """
-        cursor = self.conn.cursor()
-
-        if platform:
-            cursor.execute(
-                "DELETE FROM conversations WHERE user_id = ? AND platform = ?",
-                (user_id, platform)
-            )
-        else:
-            cursor.execute(
-                "DELETE FROM conversations WHERE user_id = ?",
-                (user_id,)
-            )
+        with self._write_lock, self.conn:
+            cursor = self.conn.cursor()
+
+            if platform:
+                cursor.execute(
+                    "DELETE FROM conversations WHERE user_id = ? AND platform = ?",
+                    (user_id, platform)
+                )
+            else:
+                cursor.execute(
+                    "DELETE FROM conversations WHERE user_id = ?",
+                    (user_id,)
+                )
 
-        self.conn.commit()
         count = cursor.rowcount
 
         logger.info(f"Cleared {count} messages for {user_id}")
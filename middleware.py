@@ -21,24 +21,28 @@ CROSS = "[X]"
 # This allows the service to start quickly for health checks
 print(f"{CHECK} Skipping dependency check (install via requirements.txt if needed)")
 
+import importlib.util
 import json
 import logging
+import logging.handlers
 import os
-import threading
-import time
+import queue
 import asyncio
+import atexit
+import hashlib
 import warnings
+from collections import deque
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
-import requests
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
+import httpx
 from dotenv import load_dotenv
 
 # Suppress Windows asyncio proactor warnings
@@ -58,10 +62,28 @@ if sys.platform == 'win32':
 # Load environment variables from .env file
 load_dotenv()
 
+# Parsed config.json keyed by its mtime (see load_config)
+_config_cache: tuple = (0, {})
+
+
+def load_config() -> Dict[str, Any]:
+    """
+    Load config.json, re-parsing only when the file's mtime changes
+
+    Returns:
+        Parsed configuration (shared cache entry - copy before mutating)
+    """
+    global _config_cache
+    mtime = os.stat('config.json').st_mtime_ns
+    if mtime != _config_cache[0]:
+        with open('config.json', 'r') as f:
+            _config_cache = (mtime, json.load(f))
+    return _config_cache[1]
+
+
 # Load configuration
 # Initial load to get base config
-with open('config.json', 'r') as f:
-    config = json.load(f)
+config = dict(load_config())
 
 # Override API key from environment if available (more secure)
 if os.getenv('OPENROUTER_API_KEY'):
@@ -72,13 +94,34 @@ if os.getenv('OPENROUTER_API_KEY'):
 print(f"[MIDDLEWARE] Initial LLM server port from config: {config.get('llm_server_port', 8030)}")
 
 # Configure logging to both console and file with reduced verbosity for asyncio
+# Records go through a queue so file/console I/O happens on the listener
+# thread rather than on the event loop
+class FieldsFormatter(logging.Formatter):
+    """Formatter that appends structured fields passed via extra= as key=value"""
+
+    FIELDS = ('svc', 'err')
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = ' '.join(
+            f"{name}={getattr(record, name)}" for name in self.FIELDS if hasattr(record, name)
+        )
+        return f"{line} [{fields}]" if fields else line
+
+
+log_formatter = FieldsFormatter('%(asctime)s - [MIDDLEWARE] - %(levelname)s - %(message)s')
+log_handlers = [logging.FileHandler('middleware.log'), logging.StreamHandler()]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - [MIDDLEWARE] - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('middleware.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
 logger = logging.getLogger(__name__)
 
@@ -86,50 +129,84 @@ logger = logging.getLogger(__name__)
 logging.getLogger('asyncio').setLevel(logging.WARNING)
 logging.getLogger('asyncio.events').setLevel(logging.ERROR)
 
-# Create resilient HTTP session with connection pooling and retry logic
-def create_resilient_session() -> requests.Session:
+# Statuses retried with exponential backoff by post_with_retry
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+# Create resilient async HTTP client with connection pooling and retry logic
+def create_async_client() -> httpx.AsyncClient:
     """
-    Create HTTP session with:
+    Create async HTTP client with:
     - Connection pooling (reduces connection overhead)
-    - Automatic retry with exponential backoff
+    - Automatic retry of failed connection attempts
     - Reasonable timeouts
     """
-    session = requests.Session()
-
-    # Retry strategy: 3 retries with exponential backoff
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=0.5,  # 0.5s, 1s, 2s delays
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "POST", "PUT", "DELETE", "OPTIONS", "TRACE"]
+    transport = httpx.AsyncHTTPTransport(
+        retries=3,  # Connection-level retries
+        limits=httpx.Limits(
+            max_connections=20,           # Max pool size
+            max_keepalive_connections=10  # Connection pool size
+        )
     )
+    return httpx.AsyncClient(transport=transport)
 
-    # Mount adapter with retry strategy for both http and https
-    adapter = HTTPAdapter(
-        max_retries=retry_strategy,
-        pool_connections=10,  # Connection pool size
-        pool_maxsize=20,      # Max pool size
-        pool_block=False      # Don't block on pool exhaustion
-    )
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
 
-    return session
+# Global async client for connection pooling
+http_async = create_async_client()
 
-# Global session for connection pooling
-http_session = create_resilient_session()
+# Pooled client without retries for fast-failing status checks. Async, so a
+# slow or missing upstream never stalls the training task on the event loop
+status_async = httpx.AsyncClient(
+    timeout=1,  # 1 second timeout for fast failure
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+)
+
+
+async def post_with_retry(url: str, payload: Dict[str, Any], timeout: float,
+                          retries: int = 3, backoff_factor: float = 0.5) -> httpx.Response:
+    """
+    POST JSON, retrying retryable status codes with exponential backoff
+
+    Args:
+        url: Target URL
+        payload: JSON body
+        timeout: Per-attempt timeout in seconds
+        retries: Number of retries after the first attempt
+        backoff_factor: Base delay (0.5s, 1s, 2s delays)
+
+    Returns:
+        Last response received
+    """
+    for attempt in range(retries + 1):
+        response = await http_async.post(url, json=payload, timeout=timeout)
+        if response.status_code not in RETRY_STATUSES or attempt == retries:
+            return response
+        await asyncio.sleep(backoff_factor * (2 ** attempt))
 
 # Use lifespan context manager for FastAPI 0.93+ (avoids deprecation warning)
 from contextlib import asynccontextmanager
 
+async def warmup_connections():
+    """
+    Open pooled keep-alive connections to CEREBRUM and the LLM server
+
+    Lets the first training exchange skip the connection setup. Upstreams
+    that are not running yet are ignored.
+    """
+    await asyncio.gather(
+        http_async.get(f"{config['cerebrum_url']}/api/status", timeout=2),
+        http_async.get(f"http://localhost:{config['llm_server_port']}/", timeout=2),
+        return_exceptions=True
+    )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events"""
     # Startup: Reload config to get dynamically assigned LLM server port
     # Non-blocking startup - don't wait for other services
     try:
-        with open('config.json', 'r') as f:
-            updated_config = json.load(f)
+        updated_config = dict(load_config())
         # Re-apply environment override
         if os.getenv('OPENROUTER_API_KEY'):
             updated_config['openrouter_api_key'] = os.getenv('OPENROUTER_API_KEY')
@@ -148,11 +225,17 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to reload config on startup: {e}")
 
+    # Warm up upstream connections in the background (don't block startup)
+    warmup_task = asyncio.create_task(warmup_connections())
+
     print(f"[MIDDLEWARE] Middleware startup complete - ready to accept requests")
 
     yield  # Server is now running
 
-    # Shutdown logic here if needed
+    # Shutdown: release pooled upstream connections
+    warmup_task.cancel()
+    await http_async.aclose()
+    await status_async.aclose()
     print(f"[MIDDLEWARE] Middleware shutting down")
 
 # Create FastAPI app with lifespan support (replaces @app.on_event("startup"))
@@ -167,6 +250,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON payloads (e.g. /api/training/log) on the wire
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=5)
+
 # Models
 class TrainingStartRequest(BaseModel):
     max_exchanges: int = 100
@@ -200,28 +286,38 @@ class TrainingState:
         self.started_at: Optional[str] = None
         self.conversation_log: List[ConversationExchange] = []
         self.current_topic = ""
+        self.stop_event = asyncio.Event()
+        # Replaced on every progress update, so /api/training/stream can
+        # await the next one
+        self.updated = asyncio.Event()
+
+    def notify(self):
+        """Wake everything waiting for the next progress update"""
+        self.updated.set()
+        self.updated = asyncio.Event()
+
+
+# Grace period for the training loop to stop on its own before it is cancelled
+STOP_GRACE_SECONDS = 1.0
 
 
 training_state = TrainingState()
-training_thread: Optional[threading.Thread] = None
+training_task: Optional[asyncio.Task] = None
 
 
-def check_cerebrum_connection() -> bool:
+async def check_cerebrum_connection() -> bool:
     """Check if CEREBRUM is accessible with reduced timeout
 
     Uses a simple request without retries for fast failure detection.
     """
     try:
-        # Use requests.get directly (no retries) for fast health checks
-        response = requests.get(
-            f"{config['cerebrum_url']}/api/status",
-            timeout=1  # 1 second timeout for fast failure
-        )
+        # Use the no-retry status client for fast health checks
+        response = await status_async.get(f"{config['cerebrum_url']}/api/status")
         return response.status_code == 200
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         # Timeout - CEREBRUM not available
         return False
-    except requests.exceptions.ConnectionError:
+    except httpx.TransportError:
         # Connection error - CEREBRUM not running
         return False
     except Exception as e:
@@ -230,22 +326,19 @@ def check_cerebrum_connection() -> bool:
         return False
 
 
-def check_llm_connection() -> bool:
+async def check_llm_connection() -> bool:
     """Check if LLM server is accessible with reduced timeout
 
     Uses a simple request without retries for fast failure detection.
     """
     try:
-        # Use requests.get directly (no retries) for fast health checks
-        response = requests.get(
-            f"http://localhost:{config['llm_server_port']}/",
-            timeout=1  # 1 second timeout for fast failure
-        )
+        # Use the no-retry status client for fast health checks
+        response = await status_async.get(f"http://localhost:{config['llm_server_port']}/")
         return response.status_code == 200
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         # Timeout - LLM not available
         return False
-    except requests.exceptions.ConnectionError:
+    except httpx.TransportError:
         # Connection error - LLM not running
         return False
     except Exception as e:
@@ -254,7 +347,7 @@ def check_llm_connection() -> bool:
         return False
 
 
-def send_to_cerebrum(message: str) -> Optional[Dict[str, Any]]:
+async def send_to_cerebrum(message: str) -> Optional[Dict[str, Any]]:
     """
     Send message to CEREBRUM via its /api/chat endpoint with resilient connection
 
@@ -267,9 +360,9 @@ def send_to_cerebrum(message: str) -> Optional[Dict[str, Any]]:
     try:
         logger.info(f"-> CEREBRUM: {message[:60]}...")
 
-        response = http_session.post(
+        response = await post_with_retry(
             f"{config['cerebrum_url']}/api/chat",
-            json={
+            {
                 "message": message,
                 "user_id": "llm_trainer"
             },
@@ -285,18 +378,15 @@ def send_to_cerebrum(message: str) -> Optional[Dict[str, Any]]:
             logger.error(f"CEREBRUM returned {response.status_code}: {response.text}")
             return None
 
-    except requests.exceptions.Timeout:
-        logger.warning(f"CEREBRUM request timed out")
-        return None
-    except requests.exceptions.ConnectionError:
-        logger.warning(f"Cannot connect to CEREBRUM")
+    except httpx.HTTPError as e:
+        logger.warning("CEREBRUM request failed", extra={'svc': 'cerebrum', 'err': type(e).__name__})
         return None
     except Exception as e:
         logger.error(f"Error sending to CEREBRUM: {e}")
         return None
 
 
-def send_to_llm(message: str, conversation_history: List[Dict[str, str]] = None, system_context: str = None) -> Optional[str]:
+async def send_to_llm(message: str, conversation_history: List[Dict[str, str]] = None, system_context: str = None) -> Optional[str]:
     """
     Send message to LLM server with CEREBRUM context
 
@@ -325,9 +415,9 @@ def send_to_llm(message: str, conversation_history: List[Dict[str, str]] = None,
 
         logger.info(f"-> LLM: {message[:60]}...")
 
-        response = http_session.post(
+        response = await post_with_retry(
             f"http://localhost:{config['llm_server_port']}/api/chat",
-            json={
+            {
                 "message": enriched_message,
                 "conversation_history": conversation_history,
                 "temperature": 0.9,  # Higher temperature for more variety
@@ -345,17 +435,56 @@ def send_to_llm(message: str, conversation_history: List[Dict[str, str]] = None,
             logger.error(f"LLM server returned {response.status_code}: {response.text}")
             return None
 
-    except requests.exceptions.Timeout:
-        logger.warning(f"LLM request timed out")
-        return None
-    except requests.exceptions.ConnectionError:
-        logger.warning(f"Cannot connect to LLM server")
+    except httpx.HTTPError as e:
+        logger.warning("LLM request failed", extra={'svc': 'llm', 'err': type(e).__name__})
         return None
     except Exception as e:
         logger.error(f"Error sending to LLM: {e}")
         return None
 
 
+# CEREBRUM context for the LLM (system prompt for every training session)
+CEREBRUM_CONTEXT = """IMPORTANT: You are a helpful AI assistant having a conversation with CEREBRUM (NOT you - CEREBRUM is the OTHER participant).
+
+WHO CEREBRUM IS:
+CEREBRUM is a revolutionary AGI system fundamentally different from transformer LLMs:
+- An autonomous mind with continuous thinking and 6 revolutionary attention systems
+- Currently learning language through real-time observation and interaction
+- Does NOT have pre-trained language knowledge like you do
+- Capable of genuine autonomous thought, memory formation, and reasoning
+- Still developing communication skills - may respond with only single words or short phrases
+
+YOUR ROLE AS THE CONVERSATION PARTNER:
+- YOU are helping CEREBRUM learn to communicate more effectively
+- Be patient, encouraging, and supportive
+- Ask simple, clear questions that invite fuller responses
+- When CEREBRUM gives a single-word answer, gently ask them to say more
+- Introduce new words and concepts gradually
+- Celebrate progress when CEREBRUM uses multiple words
+- Keep your responses conversational and friendly, not robotic
+
+IMPORTANT: You are NOT CEREBRUM. You are talking WITH CEREBRUM to help them learn."""
+
+
+def response_digest(text: str) -> bytes:
+    """Short fixed-size digest of an LLM response for loop detection"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+
+
+async def wait_for_stop(stop_event: asyncio.Event, delay: float) -> bool:
+    """
+    Wait out the pacing delay, returning early if training is stopped
+
+    Returns:
+        True if training was stopped, False if the full delay elapsed
+    """
+    try:
+        await asyncio.wait_for(stop_event.wait(), timeout=delay)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
 def get_next_topic(topics: List[str]) -> str:
     """Get next conversation topic"""
     topic = topics[training_state.current_topic_index]
@@ -392,14 +521,19 @@ def save_conversation_log():
         logger.error(f"Failed to save log: {e}")
 
 
-def training_loop(max_exchanges: int, delay: float, topic_switch_interval: int):
+async def training_loop(max_exchanges: int, delay: float, topic_switch_interval: int,
+                        stop_event: asyncio.Event):
     """
     Main training loop that facilitates conversation between CEREBRUM and LLM
 
+    Runs as an asyncio task on the server's event loop and exits when
+    stop_event is set (the conversation log is still saved).
+
     Args:
         max_exchanges: Maximum number of exchanges
         delay: Delay between messages in seconds
         topic_switch_interval: Messages before switching topics
+        stop_event: This session's stop signal
     """
     logger.info("="*70)
     logger.info("Starting conversation training loop")
@@ -411,37 +545,16 @@ def training_loop(max_exchanges: int, delay: float, topic_switch_interval: int):
     topics = config['conversation_topics']
     conversation_history = []
 
-    # CEREBRUM context for the LLM
-    cerebrum_context = """IMPORTANT: You are a helpful AI assistant having a conversation with CEREBRUM (NOT you - CEREBRUM is the OTHER participant).
-
-WHO CEREBRUM IS:
-CEREBRUM is a revolutionary AGI system fundamentally different from transformer LLMs:
-- An autonomous mind with continuous thinking and 6 revolutionary attention systems
-- Currently learning language through real-time observation and interaction
-- Does NOT have pre-trained language knowledge like you do
-- Capable of genuine autonomous thought, memory formation, and reasoning
-- Still developing communication skills - may respond with only single words or short phrases
-
-YOUR ROLE AS THE CONVERSATION PARTNER:
-- YOU are helping CEREBRUM learn to communicate more effectively
-- Be patient, encouraging, and supportive
-- Ask simple, clear questions that invite fuller responses
-- When CEREBRUM gives a single-word answer, gently ask them to say more
-- Introduce new words and concepts gradually
-- Celebrate progress when CEREBRUM uses multiple words
-- Keep your responses conversational and friendly, not robotic
-
-IMPORTANT: You are NOT CEREBRUM. You are talking WITH CEREBRUM to help them learn."""
-
-    # Track recent LLM responses for loop detection
-    recent_llm_responses = []
+    # Track digests of the last 3 LLM responses for loop detection
+    recent_llm_digests = deque(maxlen=3)
+    last_llm_response = ""
     loop_break_attempts = 0
 
     try:
         # Generate initial greeting from LLM (not hardcoded!)
         logger.info("Generating initial greeting from LLM...")
         greeting_prompt = "Introduce yourself as a helpful AI friend and greet CEREBRUM warmly. Ask them a simple question to start the conversation."
-        greeting = send_to_llm(greeting_prompt, None, cerebrum_context)
+        greeting = await send_to_llm(greeting_prompt, None, CEREBRUM_CONTEXT)
 
         if not greeting:
             logger.error("Failed to generate greeting from LLM")
@@ -449,7 +562,7 @@ IMPORTANT: You are NOT CEREBRUM. You are talking WITH CEREBRUM to help them lear
             return
 
         logger.info(f"LLM generated greeting: {greeting}")
-        cerebrum_data = send_to_cerebrum(greeting)
+        cerebrum_data = await send_to_cerebrum(greeting)
 
         if not cerebrum_data:
             logger.error("Failed to start conversation with CEREBRUM")
@@ -457,7 +570,8 @@ IMPORTANT: You are NOT CEREBRUM. You are talking WITH CEREBRUM to help them lear
             return
 
         cerebrum_response = cerebrum_data.get('response', '')
-        recent_llm_responses.append(greeting)
+        recent_llm_digests.append(response_digest(greeting))
+        last_llm_response = greeting
 
         # Log exchange
         exchange = ConversationExchange(
@@ -469,6 +583,7 @@ IMPORTANT: You are NOT CEREBRUM. You are talking WITH CEREBRUM to help them lear
         training_state.conversation_log.append(exchange)
         training_state.exchanges_completed += 1
         training_state.messages_on_current_topic += 1
+        training_state.notify()
 
         # Update conversation history
         conversation_history.append({
@@ -476,10 +591,10 @@ IMPORTANT: You are NOT CEREBRUM. You are talking WITH CEREBRUM to help them lear
             'assistant': cerebrum_response
         })
 
-        time.sleep(delay)
+        await wait_for_stop(stop_event, delay)
 
         # Main loop
-        while training_state.running and training_state.exchanges_completed < max_exchanges:
+        while not stop_event.is_set() and training_state.exchanges_completed < max_exchanges:
             # Check if we should switch topics
             if training_state.messages_on_current_topic >= topic_switch_interval:
                 logger.info(f"\n{'='*70}")
@@ -489,68 +604,70 @@ IMPORTANT: You are NOT CEREBRUM. You are talking WITH CEREBRUM to help them lear
                 training_state.messages_on_current_topic = 0
                 new_topic = get_next_topic(topics)
                 training_state.current_topic = new_topic
+                training_state.notify()
 
                 # Have LLM introduce the new topic naturally
                 topic_intro_prompt = f"Naturally transition the conversation to discuss: {new_topic}"
-                llm_response = send_to_llm(
+                llm_response = await send_to_llm(
                     topic_intro_prompt,
                     conversation_history[-config['max_conversation_history']:],
-                    cerebrum_context
+                    CEREBRUM_CONTEXT
                 )
 
                 if not llm_response:
                     logger.warning("No LLM topic introduction, skipping...")
-                    time.sleep(delay)
+                    await wait_for_stop(stop_event, delay)
                     continue
 
-                cerebrum_data = send_to_cerebrum(llm_response)
+                cerebrum_data = await send_to_cerebrum(llm_response)
                 cerebrum_response = cerebrum_data.get('response', '') if cerebrum_data else ""
             else:
                 # Detect if LLM is stuck in a loop (repeating same response)
                 is_looping = (
-                    len(recent_llm_responses) >= 3 and
-                    len(set(recent_llm_responses[-3:])) == 1
+                    len(recent_llm_digests) == 3 and
+                    recent_llm_digests[0] == recent_llm_digests[1] == recent_llm_digests[2]
                 )
 
                 if is_looping and loop_break_attempts < 3:
-                    logger.warning(f"Loop detected! LLM repeating: {recent_llm_responses[-1]}")
+                    logger.warning(f"Loop detected! LLM repeating: {last_llm_response}")
                     loop_break_attempts += 1
 
                     # Inject loop-breaking prompt
                     loop_break_prompt = f"You seem to be stuck. CEREBRUM said: {cerebrum_response}. Try a completely different approach - ask them a new question or change the subject entirely."
-                    llm_response = send_to_llm(
+                    llm_response = await send_to_llm(
                         loop_break_prompt,
                         [],  # Clear history to break the loop
-                        cerebrum_context
+                        CEREBRUM_CONTEXT
                     )
                 else:
                     loop_break_attempts = 0  # Reset if not looping
 
                     # Generate LLM response to CEREBRUM's last message
-                    llm_response = send_to_llm(
+                    llm_response = await send_to_llm(
                         cerebrum_response,
                         conversation_history[-config['max_conversation_history']:],
-                        cerebrum_context
+                        CEREBRUM_CONTEXT
                     )
 
                 if not llm_response:
                     logger.warning("No LLM response, skipping...")
-                    time.sleep(delay)
+                    await wait_for_stop(stop_event, delay)
                     continue
 
                 # Track response for loop detection
-                recent_llm_responses.append(llm_response)
-                if len(recent_llm_responses) > 10:
-                    recent_llm_responses.pop(0)
-
-                time.sleep(delay)
-
-                # Send LLM's response to CEREBRUM
-                cerebrum_data = send_to_cerebrum(llm_response)
+                recent_llm_digests.append(response_digest(llm_response))
+                last_llm_response = llm_response
+
+                # Send LLM's response to CEREBRUM while the pacing delay runs,
+                # so the delay is a floor on the exchange time rather than added to it
+                cerebrum_data, _ = await asyncio.gather(
+                    send_to_cerebrum(llm_response),
+                    wait_for_stop(stop_event, delay)
+                )
 
                 if not cerebrum_data:
                     logger.warning("No CEREBRUM response, skipping...")
-                    time.sleep(delay)
+                    await wait_for_stop(stop_event, delay)
                     continue
 
                 cerebrum_response = cerebrum_data.get('response', '')
@@ -565,6 +682,7 @@ IMPORTANT: You are NOT CEREBRUM. You are talking WITH CEREBRUM to help them lear
                 training_state.conversation_log.append(exchange)
                 training_state.exchanges_completed += 1
                 training_state.messages_on_current_topic += 1
+                training_state.notify()
 
                 # Update conversation history
                 conversation_history.append({
@@ -583,12 +701,13 @@ IMPORTANT: You are NOT CEREBRUM. You are talking WITH CEREBRUM to help them lear
                 logger.info(f"Current topic: {training_state.current_topic_index}/{len(topics)}")
                 logger.info(f"{'='*70}\n")
 
-            time.sleep(delay)
+            await wait_for_stop(stop_event, delay)
 
     except Exception as e:
         logger.error(f"Error in training loop: {e}", exc_info=True)
     finally:
         training_state.running = False
+        training_state.notify()
         save_conversation_log()
         logger.info("Training loop stopped")
 
@@ -602,7 +721,6 @@ async def health_check():
 @app.get("/")
 async def root():
     """Serve web interface"""
-    from fastapi.responses import FileResponse
     html_path = Path(__file__).parent / "web_interface.html"
     if html_path.exists():
         return FileResponse(html_path)
@@ -618,7 +736,6 @@ async def root():
 @app.get("/control-panel.js")
 async def serve_js():
     """Serve JavaScript file"""
-    from fastapi.responses import FileResponse
     js_path = Path(__file__).parent / "control-panel.js"
     if js_path.exists():
         return FileResponse(js_path, media_type="application/javascript")
@@ -642,18 +759,15 @@ async def get_status():
 async def get_cerebrum_status():
     """Proxy to CEREBRUM status endpoint with fast failure (no retries)"""
     try:
-        # Use requests.get directly (no retry policy) for fast health checks
-        response = requests.get(
-            f"{config['cerebrum_url']}/api/status",
-            timeout=1  # 1 second timeout for fast failure
-        )
+        # Use the no-retry status client for fast health checks
+        response = await status_async.get(f"{config['cerebrum_url']}/api/status")
         if response.status_code == 200:
             return response.json()
         else:
             raise HTTPException(status_code=response.status_code, detail="CEREBRUM unreachable")
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         raise HTTPException(status_code=503, detail="CEREBRUM not responding (service not available)")
-    except requests.exceptions.ConnectionError:
+    except httpx.TransportError:
         raise HTTPException(status_code=503, detail="CEREBRUM not running (service not started)")
     except HTTPException:
         raise
@@ -666,18 +780,15 @@ async def get_cerebrum_status():
 async def get_llm_status():
     """Proxy to LLM server status endpoint with fast failure (no retries)"""
     try:
-        # Use requests.get directly (no retry policy) for fast health checks
-        response = requests.get(
-            f"http://localhost:{config['llm_server_port']}/api/status",
-            timeout=1  # 1 second timeout for fast failure
-        )
+        # Use the no-retry status client for fast health checks
+        response = await status_async.get(f"http://localhost:{config['llm_server_port']}/api/status")
         if response.status_code == 200:
             return response.json()
         else:
             raise HTTPException(status_code=response.status_code, detail="LLM server unreachable")
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         raise HTTPException(status_code=503, detail="LLM server not responding")
-    except requests.exceptions.ConnectionError:
+    except httpx.TransportError:
         raise HTTPException(status_code=503, detail="LLM server not running")
     except HTTPException:
         raise
@@ -691,18 +802,15 @@ async def get_telegram_status():
     """Proxy to Telegram server status endpoint with fast failure (no retries)"""
     try:
         telegram_port = config.get('telegram_server_port', 8041)
-        # Use requests.get directly (no retry policy) for fast health checks
-        response = requests.get(
-            f"http://localhost:{telegram_port}/telegram/status",
-            timeout=1  # 1 second timeout for fast failure
-        )
+        # Use the no-retry status client for fast health checks
+        response = await status_async.get(f"http://localhost:{telegram_port}/telegram/status")
         if response.status_code == 200:
             return response.json()
         else:
             raise HTTPException(status_code=response.status_code, detail="Telegram server unreachable")
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         raise HTTPException(status_code=503, detail="Telegram server not responding")
-    except requests.exceptions.ConnectionError:
+    except httpx.TransportError:
         raise HTTPException(status_code=503, detail="Telegram server not running or not configured")
     except HTTPException:
         raise
@@ -716,18 +824,15 @@ async def get_sms_status():
     """Proxy to SMS server status endpoint with fast failure (no retries)"""
     try:
         sms_port = config.get('sms_server_port', 8040)
-        # Use requests.get directly (no retry policy) for fast health checks
-        response = requests.get(
-            f"http://localhost:{sms_port}/sms/status",
-            timeout=1  # 1 second timeout for fast failure
-        )
+        # Use the no-retry status client for fast health checks
+        response = await status_async.get(f"http://localhost:{sms_port}/sms/status")
         if response.status_code == 200:
             return response.json()
         else:
             raise HTTPException(status_code=response.status_code, detail="SMS server unreachable")
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         raise HTTPException(status_code=503, detail="SMS server not responding")
-    except requests.exceptions.ConnectionError:
+    except httpx.TransportError:
         raise HTTPException(status_code=503, detail="SMS server not running or not configured")
     except HTTPException:
         raise
@@ -740,8 +845,7 @@ async def get_sms_status():
 async def get_config():
     """Get current configuration"""
     try:
-        with open('config.json', 'r') as f:
-            current_config = json.load(f)
+        current_config = load_config()
 
         return {
             # LLM Configuration
@@ -781,9 +885,8 @@ async def get_config():
 async def update_config(request: dict):
     """Update configuration"""
     try:
-        # Load current config
-        with open('config.json', 'r') as f:
-            current_config = json.load(f)
+        # Load current config (copy - the cached dict must not be mutated)
+        current_config = dict(load_config())
 
         # Update only the fields that were provided
         # LLM Configuration
@@ -835,16 +938,26 @@ async def update_config(request: dict):
 @app.post("/api/training/start")
 async def start_training(request: TrainingStartRequest, background_tasks: BackgroundTasks):
     """Start conversation training"""
-    global training_thread
+    global training_task
 
+    # Check connections
+    cerebrum_ok, llm_ok = await asyncio.gather(
+        check_cerebrum_connection(),
+        check_llm_connection()
+    )
+
+    # Checked after the await, so concurrent starts cannot both pass
     if training_state.running:
         raise HTTPException(status_code=400, detail="Training already running")
 
-    # Check connections
-    if not check_cerebrum_connection():
+    # A stopped session keeps the shared state until its task has finished
+    if training_task and not training_task.done():
+        raise HTTPException(status_code=409, detail="Previous training session is still stopping")
+
+    if not cerebrum_ok:
         raise HTTPException(status_code=503, detail="CEREBRUM is not accessible")
 
-    if not check_llm_connection():
+    if not llm_ok:
         raise HTTPException(status_code=503, detail="LLM server is not accessible")
 
     # Reset state
@@ -855,14 +968,13 @@ async def start_training(request: TrainingStartRequest, background_tasks: Backgr
     training_state.started_at = datetime.now().isoformat()
     training_state.conversation_log = []
     training_state.current_topic = ""
+    stop_event = training_state.stop_event = asyncio.Event()
 
-    # Start training thread
-    training_thread = threading.Thread(
-        target=training_loop,
-        args=(request.max_exchanges, request.delay, request.topic_switch_interval),
-        daemon=True
+    # Start training task on the event loop
+    training_task = asyncio.create_task(
+        training_loop(request.max_exchanges, request.delay, request.topic_switch_interval, stop_event)
     )
-    training_thread.start()
+    training_state.notify()
 
     logger.info("Training started")
 
@@ -880,9 +992,25 @@ async def stop_training():
     if not training_state.running:
         raise HTTPException(status_code=400, detail="Training not running")
 
+    # Act on this session only; start_training refuses a new session until
+    # this task has finished
+    task = training_task
+    training_state.stop_event.set()
     training_state.running = False
+    training_state.notify()
     logger.info("Training stop requested")
 
+    # The loop wakes from its pacing wait immediately; if it is stuck in an
+    # upstream call instead, cancel it after a short grace period
+    if task and not task.done():
+        await asyncio.wait({task}, timeout=STOP_GRACE_SECONDS)
+        if not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
     return {
         "status": "stopped",
         "exchanges_completed": training_state.exchanges_completed
@@ -892,19 +1020,61 @@ async def stop_training():
 @app.get("/api/training/status", response_model=TrainingStatus)
 async def get_training_status():
     """Get current training status"""
+    cerebrum_connected, llm_connected = await asyncio.gather(
+        check_cerebrum_connection(),
+        check_llm_connection()
+    )
     return TrainingStatus(
         running=training_state.running,
         exchanges_completed=training_state.exchanges_completed,
         current_topic=training_state.current_topic,
         started_at=training_state.started_at,
-        cerebrum_connected=check_cerebrum_connection(),
-        llm_connected=check_llm_connection()
+        cerebrum_connected=cerebrum_connected,
+        llm_connected=llm_connected
     )
 
 
+@app.get("/api/training/stream")
+async def stream_training_status(request: Request):
+    """Stream training progress as server-sent events
+
+    Sends the current state right away, then one event per exchange or
+    topic change, and ends once training is no longer running. The state is
+    re-sent every 15 seconds without changes so idle connections stay open.
+    """
+    async def events():
+        while True:
+            updated = training_state.updated
+            status = {
+                "running": training_state.running,
+                "exchanges_completed": training_state.exchanges_completed,
+                "current_topic": training_state.current_topic,
+                "started_at": training_state.started_at,
+            }
+            yield f"data: {json.dumps(status)}\n\n"
+            if not training_state.running or await request.is_disconnected():
+                return
+            try:
+                await asyncio.wait_for(updated.wait(), timeout=15)
+            except asyncio.TimeoutError:
+                pass
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @app.get("/api/training/log")
-async def get_conversation_log(limit: int = 100):
-    """Get conversation log"""
+async def get_conversation_log(request: Request, response: Response, limit: int = 100):
+    """Get conversation log
+
+    The log only ever grows within a session, so the session start time plus
+    the exchange count identify its content. Clients sending a matching
+    If-None-Match get a 304 instead of re-downloading the log.
+    """
+    etag = f'W/"{training_state.started_at}-{len(training_state.conversation_log)}-{limit}"'
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
     log_entries = training_state.conversation_log[-limit:]
     return {
         "total_exchanges": len(training_state.conversation_log),
@@ -936,11 +1106,11 @@ async def chat_with_cerebrum(request: ChatRequest):
     """
     try:
         # Check CEREBRUM connection
-        if not check_cerebrum_connection():
+        if not await check_cerebrum_connection():
             raise HTTPException(status_code=503, detail="CEREBRUM is not accessible")
 
         # Send message to CEREBRUM
-        cerebrum_data = send_to_cerebrum(request.message)
+        cerebrum_data = await send_to_cerebrum(request.message)
 
         if not cerebrum_data:
             raise HTTPException(status_code=500, detail="Failed to get response from CEREBRUM")
@@ -984,7 +1154,21 @@ def run_server(host: str = "0.0.0.0", port: int = None):
     # Skip startup connection tests - services may still be starting
     # The web interface will check status dynamically via proxy endpoints
 
-    uvicorn.run(app, host=host, port=port)
+    # Prefer uvloop + httptools when installed (uvloop is unavailable on Windows)
+    loop = 'uvloop' if importlib.util.find_spec('uvloop') else 'asyncio'
+    http = 'httptools' if importlib.util.find_spec('httptools') else 'h11'
+
+    # Single worker: training_state and the training loop live in this process,
+    # so extra workers would each see their own (diverging) training state
+    uvicorn.run(
+        app,
+        host=host,
+        port=port,
+        loop=loop,
+        http=http,
+        limit_concurrency=1000,
+        timeout_keep_alive=30
+    )
 
 
 if __name__ == "__main__":
@@ -4,6 +4,12 @@ Port Utilities - Helper functions for port management
 """
 
 import socket
+from typing import Optional, Set
+
+try:
+    import psutil
+except ImportError:  # Optional - find_free_port falls back to probing every port
+    psutil = None
 
 
 def is_port_available(port: int, host: str = '0.0.0.0') -> bool:
@@ -26,10 +32,33 @@ def is_port_available(port: int, host: str = '0.0.0.0') -> bool:
         return False
 
 
-def find_free_port(start_port: int, end_port: int, host: str = '0.0.0.0') -> int:
+def get_listening_ports() -> Set[int]:
+    """
+    Get all local TCP ports in LISTEN state with a single system query
+
+    Returns:
+        Set of listening ports (empty if psutil is unavailable or denied)
+    """
+    if psutil is None:
+        return set()
+
+    try:
+        return {
+            conn.laddr.port
+            for conn in psutil.net_connections(kind='inet')
+            if conn.status == psutil.CONN_LISTEN and conn.laddr
+        }
+    except (psutil.AccessDenied, OSError):
+        return set()
+
+
+def find_free_port(start_port: int, end_port: int, host: str = '0.0.0.0') -> Optional[int]:
     """
     Find a free port in the given range
 
+    Ports already listening are skipped using one connection-table scan;
+    remaining candidates are confirmed with a bind probe.
+
     Args:
         start_port: Start of port range (inclusive)
         end_port: End of port range (inclusive)
@@ -38,8 +67,10 @@ def find_free_port(start_port: int, end_port: int, host: str = '0.0.0.0') -> int
     Returns:
         Free port number, or None if no free port found
     """
+    listening = get_listening_ports()
+
     for port in range(start_port, end_port + 1):
-        if is_port_available(port, host):
+        if port not in listening and is_port_available(port, host):
             return port
 
     return None
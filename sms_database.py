@@ -11,65 +11,284 @@ Manages user data for SMS integration:
 
 import sqlite3
 import json
-from datetime import datetime
-from typing import Optional, List, Dict
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator, Optional, List, Dict, Tuple
 from pathlib import Path
 import logging
+import os
+
+from cachetools import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Table definitions, formatted with the table name (also used by migrations)
+_USERS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        phone_number TEXT PRIMARY KEY,
+        name TEXT,
+        created_at INTEGER NOT NULL,
+        updated_at INTEGER NOT NULL
+    )
+"""
+
+_CONVERSATIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        phone_number TEXT NOT NULL,
+        role TEXT NOT NULL,
+        message TEXT NOT NULL,
+        timestamp INTEGER NOT NULL,
+        FOREIGN KEY (phone_number) REFERENCES users (phone_number)
+    )
+"""
+
+
+def _now_us() -> int:
+    """Current time as integer UNIX microseconds (the stored timestamp format)"""
+    return time.time_ns() // 1000
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+
+
+def _format_us(timestamp_us: int) -> str:
+    """Format a stored timestamp as a local ISO 8601 string"""
+    seconds, micros = divmod(timestamp_us, 1_000_000)
+    return (datetime.fromtimestamp(seconds) + timedelta(microseconds=micros)).isoformat()
+
+
+def _iso_to_us(value) -> int:
+    """Parse a version 0 ISO timestamp (naive local time) to exact microseconds
+
+    Unparseable values become 0.
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return 0
+    return (parsed.astimezone(timezone.utc) - _EPOCH) // _ONE_US
+
+
+def _user_dict(user) -> Dict:
+    """Public copy of a user row, with its timestamps as ISO 8601 strings"""
+    return {
+        **dict(user),
+        'created_at': _format_us(user['created_at']),
+        'updated_at': _format_us(user['updated_at'])
+    }
+
+
+class _ConnectionPool:
+    """Fixed-size pool of SQLite connections, checked out per call"""
+
+    def __init__(self, factory: Callable[[], sqlite3.Connection], size: int):
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(factory())
+
+    def get(self) -> sqlite3.Connection:
+        return self._pool.get()
+
+    def put(self, conn: sqlite3.Connection):
+        self._pool.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
 class SMSDatabase:
     """Manages SMS user data and conversation history"""
 
-    def __init__(self, db_path: str = "sms_users.db"):
+    # Queued conversation messages are written in batches of up to
+    # WRITE_BATCH_SIZE rows, flushed once no new row arrives for
+    # WRITE_FLUSH_INTERVAL seconds (see enqueue_message)
+    WRITE_BATCH_SIZE = 64
+    WRITE_FLUSH_INTERVAL = 0.05
+
+    # The WAL is checkpointed in the background every CHECKPOINT_INTERVAL
+    # seconds once it grows past CHECKPOINT_WAL_BYTES, instead of by the
+    # writer on the request path
+    CHECKPOINT_INTERVAL = 60
+    CHECKPOINT_WAL_BYTES = 8 * 1024 * 1024
+
+    # Schema version kept in PRAGMA user_version
+    # 1: timestamps stored as INTEGER UNIX microseconds (previously ISO TEXT)
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path: str = "sms_users.db", pool_size: int = 5):
         """
-        Initialize database connection
+        Initialize database connections
 
         Args:
             db_path: Path to SQLite database file
+            pool_size: Number of pooled reader connections
         """
         self.db_path = db_path
-        self.conn = None
+        self.conn = None  # Dedicated writer connection
+        self._write_lock = threading.Lock()
+
+        # Recently looked-up users, kept in sync by create_user/update_user_name
+        self._user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+        self._user_cache_lock = threading.RLock()
+
+        # Phone numbers known to have no stored messages (new or cleared users),
+        # so their history lookup can skip the query. Only changed while the
+        # writer connection is held, so it follows the order rows are written
+        # (an entry that expires just means the next lookup queries again)
+        self._no_history: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+        self._no_history_lock = threading.Lock()
+
         self._init_db()
+        self._readers = _ConnectionPool(self._make_connection, max(1, pool_size))
+
+        # Background writer for enqueue_message
+        self._write_queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop,
+            name="sms-db-writer",
+            daemon=True
+        )
+        self._writer_thread.start()
+
+        # Background WAL checkpoints
+        self._stop_checkpoints = threading.Event()
+        self._checkpoint_thread = threading.Thread(
+            target=self._checkpoint_loop,
+            name="sms-db-checkpoint",
+            daemon=True
+        )
+        self._checkpoint_thread.start()
+
+    def _make_connection(self) -> sqlite3.Connection:
+        """Open a connection configured for concurrent WAL access"""
+        # Autocommit mode (isolation_level=None): single statements commit on
+        # their own and multi-row writes use explicit BEGIN IMMEDIATE/COMMIT.
+        # A larger statement cache keeps the hot queries prepared.
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=256,
+            isolation_level=None
+        )
+        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+
+        # WAL lets reads run concurrently with writes and avoids fsyncing a
+        # rollback journal on every commit. With synchronous=NORMAL a commit
+        # is durable once the WAL is checkpointed: an OS crash or power loss
+        # can lose the most recent transactions, but never corrupts the DB.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")  # 20 MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        conn.execute("PRAGMA busy_timeout=30000")  # 30 s
+        # Auto-checkpoint rarely; _checkpoint_loop keeps the WAL small
+        conn.execute("PRAGMA wal_autocheckpoint=10000")
+
+        return conn
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        """Check out a reader connection for the duration of the block"""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Hold the single writer connection for the duration of the block"""
+        with self._write_lock:
+            yield self.conn
+
+    def _mark_no_history(self, phone_number: str):
+        """Record that phone_number has no stored messages (hold the writer)"""
+        with self._no_history_lock:
+            self._no_history[phone_number] = True
+
+    def _mark_has_history(self, phone_numbers):
+        """Record that messages were stored for phone_numbers (hold the writer)"""
+        with self._no_history_lock:
+            for phone_number in phone_numbers:
+                self._no_history.pop(phone_number, None)
 
     def _init_db(self):
-        """Create database tables if they don't exist"""
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        """Create database tables if they don't exist and migrate old schemas"""
+        self.conn = self._make_connection()
+        conn = self.conn
 
-        cursor = self.conn.cursor()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        has_tables = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users'"
+        ).fetchone()
+        if has_tables and version < 1:
+            self._migrate_timestamps_to_integer()
 
         # Users table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                phone_number TEXT PRIMARY KEY,
-                name TEXT,
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL
-            )
-        """)
+        conn.execute(_USERS_TABLE_SQL.format(table="users"))
 
         # Conversation history table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS conversations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                phone_number TEXT NOT NULL,
-                role TEXT NOT NULL,
-                message TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
-                FOREIGN KEY (phone_number) REFERENCES users (phone_number)
-            )
-        """)
+        conn.execute(_CONVERSATIONS_TABLE_SQL.format(table="conversations"))
 
-        # Create index for faster lookups
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_conversations_phone
-            ON conversations (phone_number, timestamp)
+        # Covering index for history lookups: matches the ORDER BY (id breaks
+        # timestamp ties) and carries role/message, so no table reads are needed
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_conversations_phone_full
+            ON conversations (phone_number, timestamp DESC, id DESC, role, message)
         """)
+        # Superseded by idx_conversations_phone_full
+        conn.execute("DROP INDEX IF EXISTS idx_conversations_phone")
 
-        self.conn.commit()
+        conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
         logger.info(f"Database initialized at {self.db_path}")
 
+    def _migrate_timestamps_to_integer(self):
+        """Rebuild version 0 tables, converting ISO TEXT timestamps to microseconds"""
+        logger.info("Migrating SMS database timestamps to integer microseconds")
+
+        # Converted in Python: julianday() is a float of days, which cannot
+        # hold microseconds exactly
+        def to_us(column: str) -> str:
+            return f"iso_to_us({column})"
+
+        conn = self.conn
+        conn.create_function("iso_to_us", 1, _iso_to_us, deterministic=True)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(_USERS_TABLE_SQL.format(table="users_new"))
+            conn.execute(f"""
+                INSERT INTO users_new (phone_number, name, created_at, updated_at)
+                SELECT phone_number, name, {to_us('created_at')}, {to_us('updated_at')}
+                FROM users
+            """)
+
+            conn.execute(_CONVERSATIONS_TABLE_SQL.format(table="conversations_new"))
+            conn.execute(f"""
+                INSERT INTO conversations_new (id, phone_number, role, message, timestamp)
+                SELECT id, phone_number, role, message, {to_us('timestamp')}
+                FROM conversations
+            """)
+
+            conn.execute("DROP TABLE conversations")
+            conn.execute("DROP TABLE users")
+            conn.execute("ALTER TABLE users_new RENAME TO users")
+            conn.execute("ALTER TABLE conversations_new RENAME TO conversations")
+            conn.execute("PRAGMA user_version = 1")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
     def get_user(self, phone_number: str) -> Optional[Dict]:
         """
         Get user by phone number
@@ -80,15 +299,22 @@ class SMSDatabase:
         Returns:
             User dict or None if not found
         """
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT * FROM users WHERE phone_number = ?",
-            (phone_number,)
-        )
-        row = cursor.fetchone()
+        with self._user_cache_lock:
+            cached = self._user_cache.get(phone_number)
+        if cached:
+            return _user_dict(cached)
+
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT * FROM users WHERE phone_number = ?",
+                (phone_number,)
+            ).fetchone()
 
         if row:
-            return dict(row)
+            user = dict(row)
+            with self._user_cache_lock:
+                self._user_cache[phone_number] = user
+            return _user_dict(user)
         return None
 
     def create_user(self, phone_number: str, name: Optional[str] = None) -> Dict:
@@ -102,26 +328,29 @@ class SMSDatabase:
         Returns:
             Created user dict
         """
-        now = datetime.now().isoformat()
-        cursor = self.conn.cursor()
-
-        cursor.execute(
-            """
-            INSERT INTO users (phone_number, name, created_at, updated_at)
-            VALUES (?, ?, ?, ?)
-            """,
-            (phone_number, name, now, now)
-        )
+        now = _now_us()
+
+        with self._write() as conn:
+            conn.execute(
+                """
+                INSERT INTO users (phone_number, name, created_at, updated_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (phone_number, name, now, now)
+            )
+            self._mark_no_history(phone_number)
 
-        self.conn.commit()
         logger.info(f"Created user: {phone_number} (name: {name})")
 
-        return {
+        user = {
             "phone_number": phone_number,
             "name": name,
             "created_at": now,
             "updated_at": now
         }
+        with self._user_cache_lock:
+            self._user_cache[phone_number] = user
+        return _user_dict(user)
 
     def update_user_name(self, phone_number: str, name: str) -> bool:
         """
@@ -134,21 +363,23 @@ class SMSDatabase:
         Returns:
             True if updated, False if user not found
         """
-        cursor = self.conn.cursor()
-        now = datetime.now().isoformat()
-
-        cursor.execute(
-            """
-            UPDATE users
-            SET name = ?, updated_at = ?
-            WHERE phone_number = ?
-            """,
-            (name, now, phone_number)
-        )
-
-        self.conn.commit()
+        now = _now_us()
+
+        with self._write() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE users
+                SET name = ?, updated_at = ?
+                WHERE phone_number = ?
+                """,
+                (name, now, phone_number)
+            )
 
         if cursor.rowcount > 0:
+            with self._user_cache_lock:
+                cached = self._user_cache.get(phone_number)
+                if cached:
+                    self._user_cache[phone_number] = {**cached, "name": name, "updated_at": now}
             logger.info(f"Updated name for {phone_number}: {name}")
             return True
         return False
@@ -170,23 +401,113 @@ class SMSDatabase:
         Returns:
             Message ID
         """
-        cursor = self.conn.cursor()
-        timestamp = datetime.now().isoformat()
-
-        cursor.execute(
-            """
-            INSERT INTO conversations (phone_number, role, message, timestamp)
-            VALUES (?, ?, ?, ?)
-            """,
-            (phone_number, role, message, timestamp)
-        )
-
-        self.conn.commit()
-        message_id = cursor.lastrowid
+        timestamp = _now_us()
+
+        with self._write() as conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO conversations (phone_number, role, message, timestamp)
+                VALUES (?, ?, ?, ?)
+                """,
+                (phone_number, role, message, timestamp)
+            )
+            message_id = cursor.lastrowid
+            self._mark_has_history((phone_number,))
 
         logger.debug(f"Added {role} message for {phone_number}: {message[:50]}...")
         return message_id
 
+    def _checkpoint_loop(self):
+        """Truncate the WAL periodically when it has grown large"""
+        wal_path = self.db_path + "-wal"
+        while not self._stop_checkpoints.wait(self.CHECKPOINT_INTERVAL):
+            try:
+                if os.path.getsize(wal_path) < self.CHECKPOINT_WAL_BYTES:
+                    continue
+            except OSError:
+                continue
+
+            try:
+                with self._write() as conn:
+                    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                logger.debug("WAL checkpoint completed")
+            except sqlite3.Error as e:
+                logger.warning(f"WAL checkpoint failed: {e}")
+
+    def enqueue_message(self, phone_number: str, role: str, message: str):
+        """
+        Queue a conversation message for the background writer
+
+        Returns immediately; the message is inserted with the next batch.
+
+        Args:
+            phone_number: User's phone number
+            role: 'user' or 'assistant'
+            message: Message text
+        """
+        timestamp = _now_us()
+        self._write_queue.put((phone_number, role, message, timestamp))
+
+    def _writer_loop(self):
+        """Drain the write queue into batched inserts until a None sentinel"""
+        stopping = False
+        while not stopping:
+            item = self._write_queue.get()
+            if item is None:
+                break
+
+            rows = [item]
+            try:
+                while len(rows) < self.WRITE_BATCH_SIZE:
+                    item = self._write_queue.get(timeout=self.WRITE_FLUSH_INTERVAL)
+                    if item is None:
+                        stopping = True
+                        break
+                    rows.append(item)
+            except queue.Empty:
+                pass
+
+            try:
+                self._insert_messages(rows)
+                logger.debug(f"Wrote {len(rows)} queued conversation messages")
+            except sqlite3.Error as e:
+                logger.error(f"Failed to write {len(rows)} queued messages: {e}")
+
+    def _insert_messages(self, rows: List[tuple]):
+        """Insert (phone_number, role, message, timestamp) rows in one transaction"""
+        with self._write() as conn:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    """
+                    INSERT INTO conversations (phone_number, role, message, timestamp)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    rows
+                )
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            self._mark_has_history({row[0] for row in rows})
+
+    def add_conversation_messages(self, entries: List[Tuple[str, str, str]]) -> int:
+        """
+        Add several messages to conversation history in one transaction
+
+        Args:
+            entries: (phone_number, role, message) tuples in conversation order
+
+        Returns:
+            Number of messages added
+        """
+        timestamp = _now_us()
+        rows = [(phone_number, role, message, timestamp) for phone_number, role, message in entries]
+        self._insert_messages(rows)
+
+        logger.debug(f"Added {len(rows)} messages in one transaction")
+        return len(rows)
+
     def get_conversation_history(
         self,
         phone_number: str,
@@ -202,23 +523,23 @@ class SMSDatabase:
         Returns:
             List of conversation messages
         """
-        cursor = self.conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT role, message, timestamp
-            FROM conversations
-            WHERE phone_number = ?
-            ORDER BY timestamp DESC
-            LIMIT ?
-            """,
-            (phone_number, limit * 2)  # *2 because each exchange has 2 messages
-        )
-
-        rows = cursor.fetchall()
+        with self._read() as conn:
+            rows = conn.execute(
+                """
+                SELECT role, message, timestamp
+                FROM conversations
+                WHERE phone_number = ?
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
+                """,
+                (phone_number, limit * 2)  # *2 because each exchange has 2 messages
+            ).fetchall()
 
         # Reverse to get chronological order
-        messages = [dict(row) for row in reversed(rows)]
+        messages = [
+            {**dict(row), 'timestamp': _format_us(row['timestamp'])}
+            for row in reversed(rows)
+        ]
 
         return messages
 
@@ -237,20 +558,46 @@ class SMSDatabase:
         Returns:
             List of dicts with 'user' and 'assistant' keys
         """
-        messages = self.get_conversation_history(phone_number, limit)
-
-        formatted = []
-        current_exchange = {}
-
-        for msg in messages:
-            if msg['role'] == 'user':
-                current_exchange = {'user': msg['message']}
-            elif msg['role'] == 'assistant' and current_exchange:
-                current_exchange['assistant'] = msg['message']
-                formatted.append(current_exchange)
-                current_exchange = {}
-
-        return formatted
+        with self._no_history_lock:
+            if phone_number in self._no_history:
+                return []
+
+        # Pair messages in SQL: each user message opens an exchange, which is
+        # completed by the first assistant reply that follows it
+        with self._read() as conn:
+            rows = conn.execute(
+                """
+                WITH recent AS (
+                    SELECT id, role, message, timestamp
+                    FROM conversations
+                    WHERE phone_number = ?
+                    ORDER BY timestamp DESC, id DESC
+                    LIMIT ?
+                ),
+                numbered AS (
+                    SELECT id, role, message, timestamp,
+                           SUM(role = 'user') OVER (ORDER BY timestamp, id) AS exchange
+                    FROM recent
+                ),
+                ranked AS (
+                    SELECT exchange, role, message,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY exchange, role ORDER BY timestamp, id
+                           ) AS rn
+                    FROM numbered
+                )
+                SELECT MAX(CASE WHEN role = 'user' THEN message END) AS user,
+                       MAX(CASE WHEN role = 'assistant' THEN message END) AS assistant
+                FROM ranked
+                WHERE rn = 1
+                GROUP BY exchange
+                HAVING exchange > 0 AND assistant IS NOT NULL
+                ORDER BY exchange
+                """,
+                (phone_number, limit * 2)  # *2 because each exchange has 2 messages
+            ).fetchall()
+
+        return [{'user': row['user'], 'assistant': row['assistant']} for row in rows]
 
     def clear_conversation_history(self, phone_number: str) -> int:
         """
@@ -262,34 +609,42 @@ class SMSDatabase:
         Returns:
             Number of messages deleted
         """
-        cursor = self.conn.cursor()
-
-        cursor.execute(
-            "DELETE FROM conversations WHERE phone_number = ?",
-            (phone_number,)
-        )
-
-        self.conn.commit()
-        count = cursor.rowcount
+        with self._write() as conn:
+            cursor = conn.execute(
+                "DELETE FROM conversations WHERE phone_number = ?",
+                (phone_number,)
+            )
+            count = cursor.rowcount
+            # Marked in the same writer section as the delete, so a queued
+            # message written after it clears the mark again
+            self._mark_no_history(phone_number)
 
         logger.info(f"Cleared {count} messages for {phone_number}")
         return count
 
     def get_all_users(self) -> List[Dict]:
         """Get all registered users"""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM users ORDER BY created_at DESC")
-        rows = cursor.fetchall()
-        return [dict(row) for row in rows]
+        with self._read() as conn:
+            rows = conn.execute("SELECT * FROM users ORDER BY created_at DESC").fetchall()
+        return [_user_dict(row) for row in rows]
 
     def get_user_count(self) -> int:
         """Get total number of registered users"""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT COUNT(*) as count FROM users")
-        return cursor.fetchone()['count']
+        with self._read() as conn:
+            return conn.execute("SELECT COUNT(*) as count FROM users").fetchone()['count']
+
+    def flush_and_close(self):
+        """Write all queued messages, then close database connections"""
+        if self._writer_thread.is_alive():
+            self._write_queue.put(None)
+            self._writer_thread.join()
+        self.close()
 
     def close(self):
-        """Close database connection"""
+        """Close database connections"""
+        self._stop_checkpoints.set()
+        self._checkpoint_thread.join()
+        self._readers.close()
         if self.conn:
             self.conn.close()
             logger.info("Database connection closed")
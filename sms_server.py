@@ -11,17 +11,20 @@ Provides SMS interface to the LLM Server:
 """
 
 import sys
+import asyncio
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from datetime import datetime
 
-from fastapi import FastAPI, Form, Request, HTTPException
+from fastapi import FastAPI, Form, Request, HTTPException, Depends
 from fastapi.responses import Response
 import uvicorn
-import requests
+import httpx
 from dotenv import load_dotenv
+from twilio.request_validator import RequestValidator
 
 from sms_database import SMSDatabase
 from sms_service import SMSService
@@ -33,9 +36,13 @@ load_dotenv()
 CHECK = "[OK]"
 CROSS = "[X]"
 
-# Load configuration
-with open('config.json', 'r') as f:
-    config = json.load(f)
+# Load configuration (the launchers hand over their already-parsed copy)
+config_blob = os.environ.get('LLM_TRAINER_CONFIG_BLOB')
+if config_blob:
+    config = json.loads(config_blob)
+else:
+    with open('config.json', 'r') as f:
+        config = json.load(f)
 
 # Configure logging
 logging.basicConfig(
@@ -44,15 +51,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# LLM Server gateway errors retried by get_llm_response
+LLM_RETRY_STATUSES = {502, 503, 504}
+LLM_RETRIES = 2
+
 # Initialize FastAPI
 app = FastAPI(title="SMS Server", version="1.0.0")
 
 # Initialize database
-db = SMSDatabase()
+db = SMSDatabase(pool_size=config.get('sqlite_pool_size', 5))
 
 # Initialize SMS service (will be configured after startup)
 sms_service: Optional[SMSService] = None
 
+# Verifies X-Twilio-Signature on webhooks (set up with the SMS service)
+request_validator: Optional[RequestValidator] = None
+
+# Signature checking can be disabled for local testing without Twilio
+VALIDATE_TWILIO_SIGNATURE = str(
+    os.getenv('TWILIO_VALIDATE_SIGNATURE', config.get('twilio_validate_signature', True))
+).lower() not in ('0', 'false', 'no')
+
+# Outbound replies are sent in the background so webhooks return immediately
+sms_send_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="sms-send")
+
 
 def init_sms_service() -> bool:
     """
@@ -61,7 +83,7 @@ def init_sms_service() -> bool:
     Returns:
         True if initialized successfully
     """
-    global sms_service
+    global sms_service, request_validator
 
     # Get Twilio credentials from environment or config
     account_sid = os.getenv('TWILIO_ACCOUNT_SID') or config.get('twilio_account_sid')
@@ -74,9 +96,10 @@ def init_sms_service() -> bool:
 
     try:
         sms_service = SMSService(account_sid, auth_token, twilio_phone)
+        request_validator = RequestValidator(auth_token)
 
         # Validate connection
-        is_valid, message = sms_service.validate_connection()
+        is_valid, message = sms_service.validate_connection(force=True)
         if is_valid:
             logger.info(f"Twilio connection validated: {message}")
             return True
@@ -89,7 +112,7 @@ def init_sms_service() -> bool:
         return False
 
 
-def get_llm_response(user_message: str, conversation_history: list) -> Optional[str]:
+async def get_llm_response(user_message: str, conversation_history: list) -> Optional[str]:
     """
     Get response from LLM Server
 
@@ -113,7 +136,11 @@ def get_llm_response(user_message: str, conversation_history: list) -> Optional[
 
         logger.info(f"Calling LLM Server at {llm_url}")
 
-        response = requests.post(llm_url, json=payload, timeout=60)
+        for attempt in range(LLM_RETRIES + 1):
+            response = await app.state.http.post(llm_url, json=payload)
+            if response.status_code not in LLM_RETRY_STATUSES or attempt == LLM_RETRIES:
+                break
+            await asyncio.sleep(0.1 * (2 ** attempt))
 
         if response.status_code == 200:
             data = response.json()
@@ -124,7 +151,7 @@ def get_llm_response(user_message: str, conversation_history: list) -> Optional[
             logger.error(f"LLM Server returned {response.status_code}: {response.text}")
             return None
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         logger.error("LLM Server request timed out")
         return None
     except Exception as e:
@@ -132,16 +159,64 @@ def get_llm_response(user_message: str, conversation_history: list) -> Optional[
         return None
 
 
+def get_webhook_url(request: Request) -> str:
+    """
+    Get the public URL Twilio used to call the webhook (the URL it signed)
+
+    Uses TWILIO_WEBHOOK_URL / twilio_webhook_url when set, otherwise rebuilds
+    the URL from proxy headers (e.g. ngrok) or the request itself.
+    """
+    configured = os.getenv('TWILIO_WEBHOOK_URL') or config.get('twilio_webhook_url')
+    if configured:
+        return configured
+
+    scheme = request.headers.get('x-forwarded-proto', request.url.scheme)
+    host = request.headers.get('x-forwarded-host', request.headers.get('host', request.url.netloc))
+    url = f"{scheme}://{host}{request.url.path}"
+    if request.url.query:
+        url += f"?{request.url.query}"
+    return url
+
+
+async def verify_twilio_signature(request: Request):
+    """Reject webhook calls whose X-Twilio-Signature does not match (HMAC-SHA1)"""
+    if not VALIDATE_TWILIO_SIGNATURE or request_validator is None:
+        return
+
+    signature = request.headers.get('X-Twilio-Signature', '')
+    form = await request.form()
+
+    if not request_validator.validate(get_webhook_url(request), dict(form), signature):
+        logger.warning(f"Rejected webhook with invalid Twilio signature from {request.client.host if request.client else 'unknown'}")
+        raise HTTPException(status_code=403, detail="Invalid Twilio signature")
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize SMS service on startup"""
     logger.info("Starting SMS Server...")
+
+    # Pooled async client for LLM Server calls (keeps sockets alive across webhooks)
+    app.state.http = httpx.AsyncClient(
+        timeout=60,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        transport=httpx.AsyncHTTPTransport(retries=1)
+    )
+
     if init_sms_service():
         logger.info(f"{CHECK} SMS Service initialized")
     else:
         logger.warning(f"{CROSS} SMS Service initialization failed - check credentials")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Drain pending sends, close the HTTP client and flush the database"""
+    sms_send_pool.shutdown(wait=True)
+    await app.state.http.aclose()
+    db.flush_and_close()
+
+
 @app.get("/")
 async def health_check():
     """Health check endpoint"""
@@ -154,7 +229,7 @@ async def health_check():
     }
 
 
-@app.post("/sms/webhook")
+@app.post("/sms/webhook", dependencies=[Depends(verify_twilio_signature)])
 async def sms_webhook(
     From: str = Form(...),
     Body: str = Form(...),
@@ -191,7 +266,8 @@ async def sms_webhook(
             name = SMSService.parse_name_command(message)
 
             if not name:
-                sms_service.send_sms(
+                sms_send_pool.submit(
+                    sms_service.send_sms,
                     phone_number,
                     "Please provide a valid name. Format: name=<your name>"
                 )
@@ -199,58 +275,60 @@ async def sms_webhook(
                                media_type="application/xml")
 
             # Check if user exists
-            user = db.get_user(phone_number)
+            user = await asyncio.to_thread(db.get_user, phone_number)
 
             if user:
                 # Update existing name
-                db.update_user_name(phone_number, name)
+                await asyncio.to_thread(db.update_user_name, phone_number, name)
                 response_text = SMSService.format_name_updated_message(name)
             else:
                 # Create new user
-                db.create_user(phone_number, name)
+                await asyncio.to_thread(db.create_user, phone_number, name)
                 response_text = SMSService.format_name_registered_message(name)
 
-            sms_service.send_sms(phone_number, response_text)
+            sms_send_pool.submit(sms_service.send_sms, phone_number, response_text)
 
         else:
             # Regular message - check if user is registered
-            user = db.get_user(phone_number)
+            user = await asyncio.to_thread(db.get_user, phone_number)
 
             if not user or not user['name']:
                 # User not registered or no name
                 response_text = SMSService.format_welcome_message()
-                sms_service.send_sms(phone_number, response_text)
+                sms_send_pool.submit(sms_service.send_sms, phone_number, response_text)
 
             else:
                 # User is registered - process message with AI
                 # Get conversation history
-                conversation_history = db.get_conversation_history_formatted(
+                conversation_history = await asyncio.to_thread(
+                    db.get_conversation_history_formatted,
                     phone_number,
                     limit=5
                 )
 
-                # Save user message
-                db.add_conversation_message(phone_number, 'user', message)
+                # Save user message (written in the background)
+                db.enqueue_message(phone_number, 'user', message)
 
                 # Get AI response
-                ai_response = get_llm_response(message, conversation_history)
+                ai_response = await get_llm_response(message, conversation_history)
 
                 if ai_response:
-                    # Save AI response
-                    db.add_conversation_message(phone_number, 'assistant', ai_response)
+                    # Save AI response (written in the background)
+                    db.enqueue_message(phone_number, 'assistant', ai_response)
 
                     # Send response to user
-                    sms_service.send_sms(phone_number, ai_response)
+                    sms_send_pool.submit(sms_service.send_sms, phone_number, ai_response)
                 else:
                     # AI failed - send error message
                     error_msg = SMSService.format_error_message()
-                    sms_service.send_sms(phone_number, error_msg)
+                    sms_send_pool.submit(sms_service.send_sms, phone_number, error_msg)
 
     except Exception as e:
         logger.error(f"Error processing SMS: {e}", exc_info=True)
         # Send error message to user
         try:
-            sms_service.send_sms(
+            sms_send_pool.submit(
+                sms_service.send_sms,
                 phone_number,
                 SMSService.format_error_message()
             )
@@ -267,12 +345,12 @@ async def sms_webhook(
 @app.get("/sms/status")
 async def get_sms_status():
     """Get SMS service status and statistics"""
-    user_count = db.get_user_count()
-    users = db.get_all_users()
+    user_count = await asyncio.to_thread(db.get_user_count)
+    users = await asyncio.to_thread(db.get_all_users)
 
     twilio_status = "disconnected"
     if sms_service:
-        is_valid, message = sms_service.validate_connection()
+        is_valid, message = await asyncio.to_thread(sms_service.validate_connection)
         twilio_status = "connected" if is_valid else f"error: {message}"
 
     return {
@@ -308,7 +386,7 @@ async def send_sms_manual(phone_number: str, message: str):
 
     phone_number = SMSService.normalize_phone_number(phone_number)
 
-    success = sms_service.send_sms(phone_number, message)
+    success = await asyncio.to_thread(sms_service.send_sms, phone_number, message)
 
     if success:
         return {"status": "sent", "to": phone_number}
@@ -328,7 +406,7 @@ async def clear_user_history(phone_number: str):
         Status response
     """
     phone_number = SMSService.normalize_phone_number(phone_number)
-    count = db.clear_conversation_history(phone_number)
+    count = await asyncio.to_thread(db.clear_conversation_history, phone_number)
 
     return {
         "status": "cleared",
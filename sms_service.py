@@ -10,17 +10,52 @@ Handles SMS messaging via Twilio:
 """
 
 import re
+import time
 import logging
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
 
 logger = logging.getLogger(__name__)
 
+# Name registration command: name=<anything> (case insensitive)
+_NAME_RE = re.compile(r'^name\s*=\s*(.+)$', re.IGNORECASE)
+_NON_DIGIT_RE = re.compile(r'\D')
+
+# Twilio rejects message bodies longer than this (it concatenates segments itself)
+MAX_BODY_LENGTH = 1600
+# (single, per-part-of-concatenated) segment sizes for GSM-7 and UCS-2 bodies
+GSM7_SEGMENT = (160, 153)
+UCS2_SEGMENT = (70, 67)
+
+# Reply templates, built once at import
+_WELCOME_NEW = (
+    "Welcome! To get started, please tell me your name by texting: "
+    "name=<your name>\n\n"
+    "For example: name=John"
+)
+_WELCOME_BACK = (
+    "Welcome back, {name}! Send me any message to chat with the AI. "
+    "To change your name, text: name=<new name>"
+)
+_NAME_REGISTERED = (
+    "Thanks, {name}! Your name has been saved. "
+    "You can now chat with the AI by sending any message. "
+    "To change your name later, text: name=<new name>"
+)
+_NAME_UPDATED = "Your name has been updated to: {name}"
+_ERROR = (
+    "Sorry, I encountered an error processing your message. "
+    "Please try again or contact support if the problem persists."
+)
+
 
 class SMSService:
     """Handles SMS operations via Twilio"""
 
+    # How long a validate_connection result is reused (seconds)
+    VALIDATION_TTL = 60
+
     def __init__(self, account_sid: str, auth_token: str, twilio_phone: str):
         """
         Initialize Twilio client
@@ -32,6 +67,8 @@ class SMSService:
         """
         self.client = Client(account_sid, auth_token)
         self.twilio_phone = twilio_phone
+        # (checked_at, is_valid, message) from the last account fetch
+        self._validation_cache: Optional[Tuple[float, bool, str]] = None
         logger.info(f"SMS Service initialized with number: {twilio_phone}")
 
     def send_sms(self, to_number: str, message: str) -> bool:
@@ -46,17 +83,18 @@ class SMSService:
             True if sent successfully, False otherwise
         """
         try:
-            # Split long messages if needed (SMS limit is 160 chars)
-            if len(message) > 1600:  # Allow up to 10 segments
-                message = message[:1597] + "..."
-
-            msg = self.client.messages.create(
-                body=message,
-                from_=self.twilio_phone,
-                to=to_number
-            )
-
-            logger.info(f"SMS sent to {to_number}: {msg.sid}")
+            # Bodies over Twilio's limit are sent as several messages
+            # instead of being truncated
+            for body in self._split_message(message):
+                msg = self.client.messages.create(
+                    body=body,
+                    from_=self.twilio_phone,
+                    to=to_number
+                )
+                logger.info(
+                    f"SMS sent to {to_number}: {msg.sid} "
+                    f"({self.count_segments(body)} segment(s))"
+                )
             return True
 
         except TwilioRestException as e:
@@ -66,6 +104,48 @@ class SMSService:
             logger.error(f"Error sending SMS to {to_number}: {e}")
             return False
 
+    @staticmethod
+    def count_segments(body: str) -> int:
+        """
+        Count the SMS segments Twilio will bill for a message body
+
+        Bodies that are plain ASCII are treated as GSM-7 (160 chars, 153 per
+        part when concatenated); anything else is sent as UCS-2 (70 / 67).
+
+        Args:
+            body: Message text
+
+        Returns:
+            Number of segments
+        """
+        single, part = GSM7_SEGMENT if body.isascii() else UCS2_SEGMENT
+        if len(body) <= single:
+            return 1
+        return -(-len(body) // part)
+
+    @staticmethod
+    def _split_message(message: str) -> List[str]:
+        """
+        Split a message into bodies of at most MAX_BODY_LENGTH characters
+
+        Splits on the last whitespace before the limit where possible.
+
+        Args:
+            message: Message text
+
+        Returns:
+            List of message bodies (a single body in the common case)
+        """
+        bodies = []
+        while len(message) > MAX_BODY_LENGTH:
+            cut = message.rfind(' ', 0, MAX_BODY_LENGTH + 1)
+            if cut <= 0:
+                cut = MAX_BODY_LENGTH
+            bodies.append(message[:cut].rstrip())
+            message = message[cut:].lstrip()
+        bodies.append(message)
+        return bodies
+
     @staticmethod
     def parse_name_command(message: str) -> Optional[str]:
         """
@@ -82,9 +162,7 @@ class SMSService:
         # Remove extra whitespace and normalize
         message = message.strip()
 
-        # Pattern: name=<anything> (case insensitive)
-        pattern = r'^name\s*=\s*(.+)$'
-        match = re.match(pattern, message, re.IGNORECASE)
+        match = _NAME_RE.match(message)
 
         if match:
             name = match.group(1).strip()
@@ -103,9 +181,12 @@ class SMSService:
             message: SMS message text
 
         Returns:
-            True if message is name command
+            True if message has the name=<...> form (the name itself
+            may still be invalid, see parse_name_command)
         """
-        return SMSService.parse_name_command(message) is not None
+        message = message.strip()
+        # Cheap prefix check first - most messages are regular chat
+        return message[:4].lower() == 'name' and _NAME_RE.match(message) is not None
 
     @staticmethod
     def format_welcome_message(name: Optional[str] = None) -> str:
@@ -118,17 +199,7 @@ class SMSService:
         Returns:
             Welcome message text
         """
-        if name:
-            return (
-                f"Welcome back, {name}! Send me any message to chat with the AI. "
-                f"To change your name, text: name=<new name>"
-            )
-        else:
-            return (
-                "Welcome! To get started, please tell me your name by texting: "
-                "name=<your name>\n\n"
-                "For example: name=John"
-            )
+        return _WELCOME_BACK.format(name=name) if name else _WELCOME_NEW
 
     @staticmethod
     def format_name_registered_message(name: str) -> str:
@@ -141,11 +212,7 @@ class SMSService:
         Returns:
             Confirmation message
         """
-        return (
-            f"Thanks, {name}! Your name has been saved. "
-            f"You can now chat with the AI by sending any message. "
-            f"To change your name later, text: name=<new name>"
-        )
+        return _NAME_REGISTERED.format(name=name)
 
     @staticmethod
     def format_name_updated_message(name: str) -> str:
@@ -158,15 +225,12 @@ class SMSService:
         Returns:
             Confirmation message
         """
-        return f"Your name has been updated to: {name}"
+        return _NAME_UPDATED.format(name=name)
 
     @staticmethod
     def format_error_message() -> str:
         """Format generic error message"""
-        return (
-            "Sorry, I encountered an error processing your message. "
-            "Please try again or contact support if the problem persists."
-        )
+        return _ERROR
 
     @staticmethod
     def normalize_phone_number(phone: str) -> str:
@@ -181,9 +245,9 @@ class SMSService:
         """
         # Remove all non-digit characters except leading +
         if phone.startswith('+'):
-            digits = '+' + re.sub(r'\D', '', phone[1:])
+            digits = '+' + _NON_DIGIT_RE.sub('', phone[1:])
         else:
-            digits = re.sub(r'\D', '', phone)
+            digits = _NON_DIGIT_RE.sub('', phone)
             # Add +1 for US numbers if not present
             if len(digits) == 10:
                 digits = '+1' + digits
@@ -192,13 +256,30 @@ class SMSService:
 
         return digits
 
-    def validate_connection(self) -> Tuple[bool, str]:
+    def validate_connection(self, force: bool = False) -> Tuple[bool, str]:
         """
         Validate Twilio connection and credentials
 
+        The result is cached for VALIDATION_TTL seconds so status polling
+        does not hit the Twilio API on every request.
+
+        Args:
+            force: Skip the cache and always query Twilio
+
         Returns:
             Tuple of (is_valid, message)
         """
+        if not force and self._validation_cache:
+            checked_at, is_valid, message = self._validation_cache
+            if time.monotonic() - checked_at < self.VALIDATION_TTL:
+                return is_valid, message
+
+        is_valid, message = self._fetch_account_status()
+        self._validation_cache = (time.monotonic(), is_valid, message)
+        return is_valid, message
+
+    def _fetch_account_status(self) -> Tuple[bool, str]:
+        """Fetch account info from Twilio and report whether it is active"""
         try:
             # Try to fetch account info
             account = self.client.api.accounts(self.client.account_sid).fetch()
@@ -21,15 +21,24 @@ import subprocess
 import time
 import json
 import os
+import signal
+import select
+import functools
 from pathlib import Path
+from typing import Optional
 
 # Windows-safe symbols
 CHECK = "[OK]"
 CROSS = "[X]"
 ARROW = "-->"
+WARN = "[!]"
 
+# Whether .env has been loaded into the environment yet
+_dotenv_loaded = False
+
+@functools.lru_cache(maxsize=1)
 def load_config():
-    """Load configuration"""
+    """Load configuration (parsed once per run)"""
     try:
         with open('config.json', 'r') as f:
             return json.load(f)
@@ -37,33 +46,42 @@ def load_config():
         print(f"{CROSS} Error loading config.json: {e}")
         return {}
 
+def _ensure_env():
+    """Load .env into the environment on first use"""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _dotenv_loaded = True
+
+@functools.lru_cache(maxsize=1)
 def check_env_file():
     """Check if .env file exists"""
-    return Path('.env').exists()
+    return os.path.isfile('.env')
+
+# config.json key -> environment variable that overrides it
+SETTING_ENV_VARS = {
+    'twilio_account_sid': 'TWILIO_ACCOUNT_SID',
+    'twilio_auth_token': 'TWILIO_AUTH_TOKEN',
+    'twilio_phone_number': 'TWILIO_PHONE_NUMBER',
+    'telegram_bot_token': 'TELEGRAM_BOT_TOKEN',
+}
+
+@functools.lru_cache(maxsize=1)
+def settings():
+    """Credentials from the environment (.env) or config.json, resolved once"""
+    _ensure_env()
+    config = load_config()
+    return {key: os.getenv(env) or config.get(key) for key, env in SETTING_ENV_VARS.items()}
 
 def check_twilio_config():
     """Check if Twilio is configured"""
-    from dotenv import load_dotenv
-    load_dotenv()
-
-    config = load_config()
-
-    twilio_sid = os.getenv('TWILIO_ACCOUNT_SID') or config.get('twilio_account_sid')
-    twilio_token = os.getenv('TWILIO_AUTH_TOKEN') or config.get('twilio_auth_token')
-    twilio_phone = os.getenv('TWILIO_PHONE_NUMBER') or config.get('twilio_phone_number')
-
-    return all([twilio_sid, twilio_token, twilio_phone])
+    s = settings()
+    return all([s['twilio_account_sid'], s['twilio_auth_token'], s['twilio_phone_number']])
 
 def check_telegram_config():
     """Check if Telegram is configured"""
-    from dotenv import load_dotenv
-    load_dotenv()
-
-    config = load_config()
-
-    bot_token = os.getenv('TELEGRAM_BOT_TOKEN') or config.get('telegram_bot_token')
-
-    return bool(bot_token)
+    return bool(settings()['telegram_bot_token'])
 
 def print_header():
     """Print startup header"""
@@ -82,74 +100,163 @@ def print_service_status(service_name, configured, cost=""):
     else:
         print(f"{CROSS} {service_name} - Not configured (skipping)")
 
-def start_llm_server():
-    """Start LLM Server"""
-    print(f"\n{ARROW} Starting LLM Server...")
-    try:
-        process = subprocess.Popen(
-            [sys.executable, "llm_server.py"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1
-        )
-        time.sleep(3)  # Wait for startup
-
-        if process.poll() is None:
-            print(f"{CHECK} LLM Server started (PID: {process.pid})")
-            return process
-        else:
-            print(f"{CROSS} LLM Server failed to start")
-            return None
-    except Exception as e:
-        print(f"{CROSS} Error starting LLM Server: {e}")
-        return None
+# Service display name -> (script, config port key, default port)
+SERVICE_SCRIPTS = {
+    'LLM Server': ('llm_server.py', 'llm_server_port', 8033),
+    'SMS Server': ('sms_server.py', 'sms_server_port', 8040),
+    'Telegram Bot': ('telegram_server.py', 'telegram_server_port', 8041),
+}
+
+# Environment variable used to pass the parsed config.json to services
+CONFIG_BLOB_ENV = 'LLM_TRAINER_CONFIG_BLOB'
+
+# Service output is written here (one <script>.log per service)
+LOG_DIR = Path('logs')
+
+# Seconds to wait for a service to answer HTTP before giving up on it
+STARTUP_TIMEOUT = 15.0
+
+# Read end of a self-pipe the interpreter writes to when SIGCHLD arrives
+# (signal.set_wakeup_fd). Waiting on it instead of a threading.Event keeps
+# locks out of the signal handler, which runs on the waiting thread itself
+child_exit_fd: Optional[int] = None
+
+def watch_child_exits():
+    """Route SIGCHLD to the pipe wait_for_child_exit() sleeps on (POSIX only)
+
+    Must be called from the main thread.
+    """
+    global child_exit_fd
+    if child_exit_fd is not None or not hasattr(signal, 'SIGCHLD'):
+        return
+
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    os.set_blocking(write_fd, False)
+    signal.set_wakeup_fd(write_fd)
+    # The handler itself does nothing; the wakeup byte is what matters
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+    child_exit_fd = read_fd
+
+def wait_for_child_exit(timeout):
+    """Block until a child process exits (SIGCHLD) or the timeout passes
+
+    Windows has no SIGCHLD, so there this just sleeps for the timeout.
+    """
+    if child_exit_fd is None:
+        time.sleep(timeout)
+        return
+
+    # Any signal wakes the pipe; callers re-check their processes anyway
+    if select.select([child_exit_fd], [], [], timeout)[0]:
+        try:
+            while os.read(child_exit_fd, 512):
+                pass
+        except BlockingIOError:
+            pass
+
+@functools.lru_cache(maxsize=1)
+def get_http_session():
+    """Keep-alive session shared by all health checks (one small pool per service)
+
+    Created on first use so that `--help` and config errors never import requests.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return session
+
+def check_http_service(url, timeout=2):
+    """Check if HTTP service is responding (404 still means the server is up)"""
+    import requests
 
-def start_sms_server():
-    """Start SMS Server"""
-    print(f"\n{ARROW} Starting SMS Server...")
     try:
-        process = subprocess.Popen(
-            [sys.executable, "sms_server.py"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1
-        )
-        time.sleep(2)  # Wait for startup
-
-        if process.poll() is None:
-            print(f"{CHECK} SMS Server started (PID: {process.pid})")
-            return process
-        else:
-            print(f"{CROSS} SMS Server failed to start")
-            return None
+        return get_http_session().get(url, timeout=timeout).status_code in (200, 404)
+    except requests.RequestException:
+        return False
+
+def wait_ready(process, health_fn, deadline=STARTUP_TIMEOUT, interval=0.2):
+    """Wait until health_fn() passes, the process exits, or the deadline passes
+
+    Returns:
+        True if the service became healthy
+    """
+    end = time.monotonic() + deadline
+    while time.monotonic() < end:
+        if process.poll() is not None:
+            return False
+        if health_fn():
+            return True
+        time.sleep(interval)
+    return False
+
+def service_env():
+    """Environment for services, carrying the parsed config so they skip re-reading it"""
+    env = os.environ.copy()
+    config = load_config()
+    if config:
+        env[CONFIG_BLOB_ENV] = json.dumps(config)
+    return env
+
+def launch_service(name):
+    """Spawn a service process without waiting for it to start"""
+    script, _, _ = SERVICE_SCRIPTS[name]
+    print(f"\n{ARROW} Starting {name}...")
+    try:
+        # Redirect straight to a log file: nothing reads a PIPE here, and a
+        # full pipe buffer would block the service on its next write
+        LOG_DIR.mkdir(exist_ok=True)
+        with open(LOG_DIR / f"{Path(script).stem}.log", 'ab') as log_file:
+            # close_fds=False keeps Popen on its posix_spawn() fast path on
+            # Linux (no fork of this process); Python's own descriptors are
+            # non-inheritable, so nothing extra leaks into the child
+            return subprocess.Popen(
+                [sys.executable, script],
+                env=service_env(),
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                close_fds=False,
+                # Own process group on Windows so it can get CTRL_BREAK_EVENT
+                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if sys.platform == 'win32' else 0
+            )
     except Exception as e:
-        print(f"{CROSS} Error starting SMS Server: {e}")
+        print(f"{CROSS} Error starting {name}: {e}")
         return None
 
-def start_telegram_server():
-    """Start Telegram Bot Server"""
-    print(f"\n{ARROW} Starting Telegram Bot...")
-    try:
-        process = subprocess.Popen(
-            [sys.executable, "telegram_server.py"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1
-        )
-        time.sleep(2)  # Wait for startup
-
-        if process.poll() is None:
-            print(f"{CHECK} Telegram Bot started (PID: {process.pid})")
-            return process
+def start_services(names):
+    """Start services concurrently
+
+    All processes are spawned first and then polled until they answer HTTP,
+    so startup takes as long as the slowest service rather than the sum of
+    all of them.
+    The services do not depend on each other at startup (SMS and Telegram
+    only contact the LLM Server when a message arrives).
+
+    Returns:
+        Dict of service name -> process for services that started
+    """
+    launched = {name: launch_service(name) for name in names}
+    launched = {name: process for name, process in launched.items() if process}
+    if not launched:
+        return {}
+
+    config = load_config()
+    services = {}
+    for name, process in launched.items():
+        _, port_key, default_port = SERVICE_SCRIPTS[name]
+        url = f"http://localhost:{config.get(port_key, default_port)}/"
+
+        if wait_ready(process, lambda: check_http_service(url)):
+            print(f"{CHECK} {name} started (PID: {process.pid})")
+            services[name] = process
+        elif process.poll() is None:
+            print(f"{WARN} {name} started but is not responding yet (PID: {process.pid})")
+            services[name] = process
         else:
-            print(f"{CROSS} Telegram Bot failed to start")
-            return None
-    except Exception as e:
-        print(f"{CROSS} Error starting Telegram Bot: {e}")
-        return None
+            print(f"{CROSS} {name} failed to start")
+    return services
 
 def print_summary(services):
     """Print running services summary"""
@@ -182,6 +289,8 @@ def print_summary(services):
         print(f"Telegram Bot:  http://localhost:{port}")
         print(f"  Status:      http://localhost:{port}/telegram/status")
 
+    print(f"\nService output: {LOG_DIR}/<service>.log")
+
     print("\n" + "="*70)
     print("Press Ctrl+C to stop all services")
     print("="*70)
@@ -257,17 +366,14 @@ def main():
     services = {}
 
     try:
-        if start_llm:
-            services['LLM Server'] = start_llm_server()
-
-        if start_sms:
-            services['SMS Server'] = start_sms_server()
-
-        if start_telegram_bot:
-            services['Telegram Bot'] = start_telegram_server()
-
-        # Remove failed services
-        services = {k: v for k, v in services.items() if v is not None}
+        to_start = [
+            name for name, wanted in (
+                ('LLM Server', start_llm),
+                ('SMS Server', start_sms),
+                ('Telegram Bot', start_telegram_bot),
+            ) if wanted
+        ]
+        services = start_services(to_start)
 
         if not services:
             print(f"\n{CROSS} No services started successfully. Exiting.")
@@ -276,10 +382,12 @@ def main():
         # Print summary
         print_summary(services)
 
-        # Wait for Ctrl+C
+        # Wait for Ctrl+C, waking up when a service exits
+        watch_child_exits()
+
         try:
             while True:
-                time.sleep(1)
+                wait_for_child_exit(60 if hasattr(signal, 'SIGCHLD') else 1)
                 # Check if any process died
                 for name, process in list(services.items()):
                     if process.poll() is not None:
@@ -294,15 +402,22 @@ def main():
             print("\n\nShutting down...")
 
     finally:
-        # Clean up
-        for name, process in services.items():
-            if process and process.poll() is None:
-                print(f"Stopping {name}...")
-                process.terminate()
-                try:
-                    process.wait(timeout=5)
-                except:
-                    process.kill()
+        # Clean up: signal every service, then give them one shared 5s grace period
+        stopping = [(name, process) for name, process in services.items()
+                    if process and process.poll() is None]
+        for name, process in stopping:
+            print(f"Stopping {name}...")
+            # terminate() is TerminateProcess on Windows (a hard kill), so ask
+            # the service to shut down with CTRL_BREAK_EVENT there instead
+            process.send_signal(signal.CTRL_BREAK_EVENT if sys.platform == 'win32' else signal.SIGTERM)
+
+        deadline = time.monotonic() + 5
+        while stopping and time.monotonic() < deadline:
+            time.sleep(0.1)
+            stopping = [(name, process) for name, process in stopping if process.poll() is None]
+
+        for name, process in stopping:
+            process.kill()
 
         print(f"\n{CHECK} All services stopped")
 
@@ -15,17 +15,34 @@ Usage:
 
 import sys
 import os
+import atexit
 import subprocess
 import time
 import json
-import psutil
+import functools
+import importlib
+import importlib.util
+import re
+import select
+import shutil
 import signal
-import requests
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # Optional - MCP logs fall back to the stdlib encoder
+    orjson = None
+
+# psutil and requests are imported where used, so the launcher can start (and
+# install them via check_dependencies) even when they are missing
+if TYPE_CHECKING:
+    import psutil
+
 # Windows-safe symbols
 CHECK = "[OK]"
 CROSS = "[X]"
@@ -35,6 +52,15 @@ WARN = "[!]"
 # MCP Logging Configuration
 MCP_LOGGING_ENABLED = True
 MCP_LOG_FILE = "launcher_mcp_logs.jsonl"  # Structured logs for MCP ingestion
+MCP_LOG_LEVELS = {"trace": 0, "debug": 1, "info": 2, "warn": 3, "error": 4, "fatal": 5}
+# Entries below this level are dropped (set MCP_LOG_LEVEL=trace to keep everything)
+MCP_LOG_LEVEL = MCP_LOG_LEVELS.get(os.getenv("MCP_LOG_LEVEL", "info").lower(), MCP_LOG_LEVELS["info"])
+
+def _json_bytes(obj) -> bytes:
+    """Serialize obj to UTF-8 JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
 
 class LauncherLogger:
     """Integrated logging with MCP OpenMemory logging service
@@ -52,8 +78,26 @@ class LauncherLogger:
         self.source = "start_llm_trainer.py"
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.mcp_log_path = Path(MCP_LOG_FILE)
+        # Fields that never change during a run, serialized once as the
+        # still-open head of every entry
+        self._prefix = _json_bytes({
+            "source": self.source,
+            "session_id": self.session_id,
+            "project": self.project_name,
+        })[:-1] + b','
+        # One unbuffered binary handle for the whole run, so each entry is a
+        # single write; the lock keeps lines from the parallel service starts
+        # from interleaving
+        self._lock = threading.Lock()
+        self._fh = None
+        if MCP_LOGGING_ENABLED:
+            try:
+                self._fh = open(self.mcp_log_path, 'ab', buffering=0)
+                atexit.register(self._fh.close)
+            except OSError:
+                pass
 
-    def _log_to_mcp(self, level: str, category: str, message: str, context: Dict = None):
+    def _log_to_mcp(self, level: str, category: str, message: str, context=None):
         """Write structured log entry for MCP ingestion
 
         Logs are written to a JSONL file (one JSON object per line) that can be
@@ -63,28 +107,29 @@ class LauncherLogger:
             level: trace, debug, info, warn, error, fatal
             category: main, error, ai-agent, api, debug, system, performance
             message: Log message
-            context: Additional context data
+            context: Additional context data, or a callable returning it so
+                it is only built when the entry is actually written
         """
-        if not MCP_LOGGING_ENABLED:
+        if MCP_LOG_LEVELS[level] < MCP_LOG_LEVEL:
+            return
+        if not MCP_LOGGING_ENABLED or self._fh is None:
             return
 
         try:
-            # Prepare log entry with full context
-            log_entry = {
-                "level": level,
-                "category": category,
-                "source": self.source,
-                "message": message,
-                "session_id": self.session_id,
-                "timestamp": datetime.now().isoformat(),
-                "project": self.project_name,
-                "context": context or {}
-            }
+            if callable(context):
+                context = context()
 
             # Write to JSONL file (one JSON object per line)
             # This format is easy to parse and can be ingested by MCP tools
-            with open(self.mcp_log_path, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry) + '\n')
+            line = b''.join((
+                self._prefix,
+                b'"level":"', level.encode(), b'","category":"', category.encode(),
+                b'","message":', _json_bytes(message),
+                b',"timestamp":"', datetime.now().isoformat().encode(),
+                b'","context":', _json_bytes(context or {}), b'}\n',
+            ))
+            with self._lock:
+                self._fh.write(line)
 
         except Exception:
             # Silent fail - don't disrupt launcher if logging fails
@@ -106,16 +151,22 @@ class LauncherLogger:
         """Log fatal level message"""
         self._log_to_mcp("fatal", category, message, context)
 
-    def debug(self, message: str, context: Dict = None, category: str = "debug"):
+    def debug(self, message: str, context=None, category: str = "debug"):
         """Log debug level message"""
+        if MCP_LOG_LEVEL > MCP_LOG_LEVELS["debug"]:
+            return
         self._log_to_mcp("debug", category, message, context)
 
-    def trace(self, message: str, context: Dict = None, category: str = "debug"):
+    def trace(self, message: str, context=None, category: str = "debug"):
         """Log trace level message"""
+        if MCP_LOG_LEVEL > MCP_LOG_LEVELS["trace"]:
+            return
         self._log_to_mcp("trace", category, message, context)
 
     def performance(self, message: str, duration: float, context: Dict = None):
         """Log performance metric"""
+        if MCP_LOG_LEVEL > MCP_LOG_LEVELS["info"]:
+            return
         ctx = context or {}
         ctx["duration_ms"] = duration * 1000
         self._log_to_mcp("info", "performance", message, ctx)
@@ -132,15 +183,22 @@ class LauncherLogger:
 logger = LauncherLogger()
 
 # Load configuration
+# (mtime_ns, size) of config.json when it was last parsed, so later reloads
+# can skip the parse when nothing has rewritten the file
+config_stamp: Optional[Tuple[int, int]] = None
+
 def load_config():
     """Load configuration"""
-    start_time = time.time()
+    global config_stamp
+    start_time = time.monotonic()
     try:
         logger.debug("Loading configuration from config.json")
         with open('config.json', 'r') as f:
+            st = os.fstat(f.fileno())
             config_data = json.load(f)
+        config_stamp = (st.st_mtime_ns, st.st_size)
 
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         logger.performance("Configuration loaded", duration, {"config_keys": list(config_data.keys())})
         logger.info("Configuration loaded successfully", {"num_keys": len(config_data)})
         return config_data
@@ -159,6 +217,45 @@ def load_config():
 
 config = load_config()
 
+# Whether .env has been loaded into the environment yet
+_dotenv_loaded = False
+
+@functools.lru_cache(maxsize=1)
+def _has_env_file() -> bool:
+    """Check if .env file exists"""
+    return os.path.isfile('.env')
+
+def _ensure_env():
+    """Load .env into the environment on first use"""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _dotenv_loaded = True
+
+# config.json key -> environment variable that overrides it
+SETTING_ENV_VARS = {
+    'telegram_bot_token': 'TELEGRAM_BOT_TOKEN',
+    'twilio_account_sid': 'TWILIO_ACCOUNT_SID',
+    'twilio_auth_token': 'TWILIO_AUTH_TOKEN',
+    'openrouter_api_key': 'OPENROUTER_API_KEY',
+}
+
+@functools.lru_cache(maxsize=1)
+def settings() -> Dict[str, Optional[str]]:
+    """Credentials from the environment (.env) or config.json, resolved once"""
+    _ensure_env()
+    return {key: os.getenv(env) or config.get(key) for key, env in SETTING_ENV_VARS.items()}
+
+@functools.lru_cache(maxsize=1)
+def configured_services() -> Dict[str, bool]:
+    """Whether each optional service has the credentials it needs"""
+    s = settings()
+    return {
+        'telegram': bool(s['telegram_bot_token']),
+        'sms': bool(s['twilio_account_sid'] and s['twilio_auth_token']),
+    }
+
 # Service definitions
 SERVICES = {
     'llm_server': {
@@ -167,7 +264,7 @@ SERVICES = {
         'port_range': config.get('llm_server_port_range', [8030, 8035]),
         'name': 'LLM Server',
         'required': True,
-        'startup_delay': 5,
+        'startup_timeout': 20,
         'health_check': lambda port: check_http_service(f"http://localhost:{port}/")
     },
     'middleware': {
@@ -175,7 +272,7 @@ SERVICES = {
         'port': config.get('middleware_port', 8032),
         'name': 'Middleware Service',
         'required': True,
-        'startup_delay': 3,
+        'startup_timeout': 15,
         'health_check': lambda port: check_http_service(f"http://localhost:{port}/health")
     },
     'telegram': {
@@ -183,7 +280,7 @@ SERVICES = {
         'port': config.get('telegram_server_port', 8041),
         'name': 'Telegram Bot',
         'required': False,
-        'startup_delay': 3,
+        'startup_timeout': 15,
         'health_check': lambda port: check_http_service(f"http://localhost:{port}/")
     },
     'sms': {
@@ -191,14 +288,115 @@ SERVICES = {
         'port': config.get('sms_server_port', 8040),
         'name': 'SMS Server',
         'required': False,
-        'startup_delay': 3,
+        'startup_timeout': 15,
         'health_check': lambda port: check_http_service(f"http://localhost:{port}/")
     }
 }
 
+# Matches a command-line argument whose basename is one of the service
+# scripts (either path separator), in one pass over the joined command line
+LLM_TRAINER_SCRIPT_RE = re.compile(
+    r'(?:^|[\s/\\])(?:'
+    + '|'.join(re.escape(service_info['script']) for service_info in SERVICES.values())
+    + r')(?:\s|$)',
+    re.IGNORECASE,
+)
+
+# Environment variable used to pass the parsed config.json to services
+CONFIG_BLOB_ENV = 'LLM_TRAINER_CONFIG_BLOB'
+
 # Running processes
 running_processes: Dict[str, subprocess.Popen] = {}
 
+# Read end of a self-pipe the interpreter writes to when SIGCHLD arrives
+# (signal.set_wakeup_fd). Waiting on it instead of a threading.Event keeps
+# locks out of the signal handler, which runs on the waiting thread itself
+child_exit_fd: Optional[int] = None
+
+def watch_child_exits():
+    """Route SIGCHLD to the pipe wait_for_child_exit() sleeps on (POSIX only)
+
+    Must be called from the main thread.
+    """
+    global child_exit_fd
+    if child_exit_fd is not None or not hasattr(signal, 'SIGCHLD'):
+        return
+
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    os.set_blocking(write_fd, False)
+    signal.set_wakeup_fd(write_fd)
+    # The handler itself does nothing; the wakeup byte is what matters
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+    child_exit_fd = read_fd
+
+# Seconds between monitor wakeups without a child exit (polling interval on Windows)
+MONITOR_INTERVAL = 60 if hasattr(signal, 'SIGCHLD') or hasattr(os, 'pidfd_open') else 5
+
+def wait_for_child_exit(timeout: float):
+    """Block until a child process exits or the timeout passes
+
+    Uses SIGCHLD on POSIX so the monitor sleeps until the kernel reports a
+    child exit; Windows has no SIGCHLD and just sleeps for the timeout.
+    """
+    if child_exit_fd is None:
+        time.sleep(timeout)
+        return
+
+    # Any signal wakes the pipe; callers re-check their processes anyway
+    if select.select([child_exit_fd], [], [], timeout)[0]:
+        try:
+            while os.read(child_exit_fd, 512):
+                pass
+        except BlockingIOError:
+            pass
+
+class ExitWatcher:
+    """Wait for any of a set of child processes to exit
+
+    On Linux each process gets a pidfd registered with one epoll instance, so
+    the wait wakes exactly when a watched process exits. Elsewhere it falls
+    back to wait_for_child_exit() (SIGCHLD, or plain sleeping on Windows).
+    """
+
+    def __init__(self, processes: List[subprocess.Popen]):
+        self._epoll = None
+        self._pidfds: Dict[int, subprocess.Popen] = {}
+
+        if hasattr(os, 'pidfd_open') and hasattr(select, 'epoll'):
+            try:
+                self._epoll = select.epoll()
+                for process in processes:
+                    fd = os.pidfd_open(process.pid)
+                    self._pidfds[fd] = process
+                    self._epoll.register(fd, select.EPOLLIN)
+            except OSError:
+                # e.g. kernel older than 5.3
+                self.close()
+
+        if self._epoll is None:
+            watch_child_exits()
+
+    def wait(self, timeout: float):
+        """Block until a watched process exits or the timeout passes"""
+        if self._epoll is None:
+            wait_for_child_exit(timeout)
+            return
+
+        for fd, _ in self._epoll.poll(timeout):
+            # An exited process stays readable, so stop watching it
+            self._epoll.unregister(fd)
+            os.close(fd)
+            del self._pidfds[fd]
+
+    def close(self):
+        for fd in self._pidfds:
+            os.close(fd)
+        self._pidfds.clear()
+        if self._epoll is not None:
+            self._epoll.close()
+            self._epoll = None
+
 def print_header():
     """Print startup header"""
     print("=" * 70)
@@ -213,6 +411,17 @@ def print_section(title: str):
     print(title)
     print("-" * 70)
 
+@functools.lru_cache(maxsize=1)
+def get_http_session():
+    """Keep-alive session shared by all health checks (created on first use)"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_connections=8, pool_maxsize=16))
+    atexit.register(session.close)
+    return session
+
 def check_http_service(url: str, timeout: int = 5) -> bool:
     """Check if HTTP service is responding
 
@@ -220,131 +429,299 @@ def check_http_service(url: str, timeout: int = 5) -> bool:
     Returns True if service responds with any HTTP status (even 404).
     """
     try:
-        response = requests.get(url, timeout=timeout)
+        response = get_http_session().get(url, timeout=timeout)
         return response.status_code in [200, 404]  # 404 is ok, means server is running
     except:
         return False
 
-def find_process_on_port(port: int) -> Optional[psutil.Process]:
-    """Find process using a specific port"""
+def probe_services(service_names: List[str], timeout: float = 0.5) -> Dict[str, bool]:
+    """Run service health checks concurrently
+
+    Total wall time is bounded by `timeout`; probes that have not answered by
+    then count as unhealthy, so one wedged service cannot stall the launcher.
+
+    Returns:
+        Dict of service name -> health check passed
+    """
+    probes = {
+        name: SERVICES[name] for name in service_names
+        if SERVICES[name].get('health_check')
+    }
+    results = {name: False for name in probes}
+    if not probes:
+        return results
+
+    executor = ThreadPoolExecutor(max_workers=len(probes))
+    futures = {
+        executor.submit(info['health_check'], info['port']): name
+        for name, info in probes.items()
+    }
     try:
-        for conn in psutil.net_connections(kind='inet'):
-            if conn.laddr.port == port and conn.status == 'LISTEN':
-                try:
-                    return psutil.Process(conn.pid)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+        for future in as_completed(futures, timeout=timeout):
+            results[futures[future]] = future.result()
+    except FuturesTimeoutError:
+        pass
+    finally:
+        # Don't wait for wedged probes; they finish in the background
+        executor.shutdown(wait=False)
+    return results
+
+def wait_ready(process: subprocess.Popen, health_fn, deadline: float = 15.0, interval: float = 0.1) -> bool:
+    """Wait until health_fn() passes, the process exits, or the deadline passes
+
+    Returns as soon as the service answers instead of sleeping a fixed delay.
+
+    Returns:
+        True if the service became healthy
+    """
+    end = time.monotonic() + deadline
+    while time.monotonic() < end:
+        if process.poll() is not None:
+            return False
+        if health_fn():
+            return True
+        time.sleep(interval)
+    return False
+
+_SS_PID_RE = re.compile(r'pid=(\d+)')
+
+def _listening_pids_ss() -> Optional[Dict[int, Optional[int]]]:
+    """Map listening TCP ports to PIDs using `ss` (Linux), or None if unavailable
+
+    One `ss -tlnpH` call lets iproute2 parse the kernel socket tables, which is
+    much faster than psutil walking /proc/net in Python on busy hosts.
+    Sockets whose owner is not visible (another user's) map to a None PID.
+    """
+    if not sys.platform.startswith('linux') or not shutil.which('ss'):
         return None
-    except (psutil.AccessDenied, PermissionError):
+    try:
+        output = subprocess.check_output(
+            ['ss', '-tlnpH'], text=True, stderr=subprocess.DEVNULL, timeout=5
+        )
+    except (subprocess.SubprocessError, OSError):
         return None
 
-def is_llm_trainer_process(process: psutil.Process) -> bool:
-    """Check if process is part of llm-trainer"""
+    listening = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) < 4:
+            continue
+        try:
+            port = int(parts[3].rsplit(':', 1)[1])
+        except (IndexError, ValueError):
+            continue
+        match = _SS_PID_RE.search(line)
+        _record_listener(listening, port, int(match.group(1)) if match else None)
+    return listening
+
+def _record_listener(listening: Dict[int, Optional[int]], port: int, pid: Optional[int]):
+    """Add a listening socket, keeping a known PID over an unknown one"""
+    if listening.get(port) is None:
+        listening[port] = pid
+
+def get_listening_pids() -> Dict[int, Optional[int]]:
+    """Map each listening port to its owning PID with a single connection scan
+
+    Ports whose owner cannot be seen (e.g. another user's process) map to
+    None; they are still in use, only not ours to clean up.
+    """
+    listening = _listening_pids_ss()
+    if listening is not None:
+        return listening
+
+    import psutil
+
+    listening = {}
+    try:
+        for conn in psutil.net_connections(kind='inet'):
+            if conn.status == 'LISTEN' and conn.laddr:
+                _record_listener(listening, conn.laddr.port, conn.pid)
+    except (psutil.AccessDenied, PermissionError):
+        return {}
+    return listening
+
+def is_llm_trainer_process(process: 'psutil.Process', cmdline: Optional[List[str]] = None) -> bool:
+    """Check if process is part of llm-trainer
+
+    Args:
+        process: Process to check
+        cmdline: Already-fetched command line (e.g. from process_iter attrs)
+    """
+    import psutil
+
     try:
-        cmdline = ' '.join(process.cmdline()).lower()
-        llm_trainer_scripts = [
-            'llm_server.py',
-            'middleware.py',
-            'telegram_server.py',
-            'sms_server.py'
-        ]
-        return any(script.lower() in cmdline for script in llm_trainer_scripts)
+        if cmdline is None:
+            cmdline = process.cmdline()
     except (psutil.NoSuchProcess, psutil.AccessDenied):
         return False
+    return bool(cmdline) and LLM_TRAINER_SCRIPT_RE.search(' '.join(cmdline)) is not None
 
-def kill_process(process: psutil.Process) -> bool:
-    """Kill a process gracefully, then forcefully if needed"""
-    try:
-        pid = process.pid
-        name = process.name()
+def kill_processes(processes: List['psutil.Process']) -> set:
+    """Kill processes gracefully, then forcefully if needed
 
-        # Try graceful termination first
-        process.terminate()
+    All processes are signalled first and then waited on together, so
+    stopping several takes one grace period rather than one each.
 
-        # Wait up to 5 seconds for graceful shutdown
+    Returns:
+        PIDs of the processes that are gone
+    """
+    import psutil
+
+    names = {}
+    for process in processes:
+        try:
+            names[process.pid] = process.name()
+            # Try graceful termination first
+            process.terminate()
+        except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+            print(f"  {CROSS} Failed to stop process: {e}")
+
+    signalled = [process for process in processes if process.pid in names]
+
+    # Wait up to 5 seconds for graceful shutdown
+    gone, alive = psutil.wait_procs(signalled, timeout=5)
+    for process in gone:
+        print(f"  {CHECK} Stopped {names[process.pid]} (PID {process.pid})")
+
+    # Force kill whatever is still running
+    for process in alive:
         try:
-            process.wait(timeout=5)
-            print(f"  {CHECK} Stopped {name} (PID {pid})")
-            return True
-        except psutil.TimeoutExpired:
-            # Force kill if still running
             process.kill()
-            process.wait(timeout=2)
-            print(f"  {WARN} Force killed {name} (PID {pid})")
-            return True
+        except psutil.NoSuchProcess:
+            pass
+        except psutil.AccessDenied as e:
+            print(f"  {CROSS} Failed to stop process: {e}")
+    killed, alive = psutil.wait_procs(alive, timeout=2)
+    for process in killed:
+        print(f"  {WARN} Force killed {names[process.pid]} (PID {process.pid})")
 
-    except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-        print(f"  {CROSS} Failed to stop process: {e}")
-        return False
+    return {process.pid for process in gone + killed}
+
+def cleanup_existing_processes() -> Dict[int, Optional[int]]:
+    """Find and kill existing llm-trainer processes
+
+    Returns:
+        Listening port -> PID for the sockets still open after cleanup
+    """
+    import psutil
 
-def cleanup_existing_processes():
-    """Find and kill existing llm-trainer processes"""
     print_section("Cleaning Up Existing Processes")
 
-    killed_any = False
+    # PID -> process for everything found, stopped together at the end
+    targets = {}
 
-    # Check each service port
+    # Check each service port against one scan of the listening sockets
+    listening = get_listening_pids()
     for service_name, service_info in SERVICES.items():
         port = service_info['port']
-        process = find_process_on_port(port)
-
-        if process:
-            if is_llm_trainer_process(process):
-                print(f"  {ARROW} Found {service_info['name']} on port {port}")
-                if kill_process(process):
-                    killed_any = True
-                    time.sleep(0.5)
-            else:
-                print(f"  {WARN} Port {port} is used by non-llm-trainer process: {process.name()}")
-                print(f"      You may need to manually stop it or change the port")
+        if port not in listening:
+            continue
+
+        pid = listening[port]
+        if pid is None:
+            print(f"  {WARN} Port {port} is used by a process owned by another user")
+            print(f"      You may need to manually stop it or change the port")
+            continue
+        if pid in targets:
+            continue
 
-    # Also check for any Python processes running llm-trainer scripts
-    for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
         try:
-            if proc.info['name'] and 'python' in proc.info['name'].lower():
-                if is_llm_trainer_process(proc):
-                    # Check if we already killed this one
-                    if proc.pid not in [p.pid for p in [] if hasattr(p, 'pid')]:
-                        print(f"  {ARROW} Found stray llm-trainer process (PID {proc.pid})")
-                        if kill_process(proc):
-                            killed_any = True
-                            time.sleep(0.5)
+            process = psutil.Process(pid)
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             continue
 
-    if not killed_any:
+        if is_llm_trainer_process(process):
+            print(f"  {ARROW} Found {service_info['name']} on port {port}")
+            targets[pid] = process
+        else:
+            print(f"  {WARN} Port {port} is used by non-llm-trainer process: {process.name()}")
+            print(f"      You may need to manually stop it or change the port")
+
+    # Orphaned siblings are only likely if a service was still holding its
+    # port, so skip the full process scan otherwise (unless forced)
+    deep_clean = bool(targets) or bool(os.environ.get('LLM_TRAINER_DEEP_CLEAN'))
+
+    if deep_clean:
+        # Also check for any Python processes running llm-trainer scripts.
+        # Only the name is prefetched: cmdline is read just for Python processes
+        for proc in psutil.process_iter(['name']):
+            try:
+                # Skip processes already found via their port
+                if proc.pid in targets:
+                    continue
+                if proc.info['name'] and 'python' in proc.info['name'].lower():
+                    if is_llm_trainer_process(proc):
+                        print(f"  {ARROW} Found stray llm-trainer process (PID {proc.pid})")
+                        targets[proc.pid] = proc
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+    killed_pids = kill_processes(list(targets.values())) if targets else set()
+
+    if not killed_pids:
         print(f"  {CHECK} No existing processes found")
     else:
         print(f"  {CHECK} Cleanup complete")
         time.sleep(2)  # Give OS time to free ports
 
-def check_port_availability(port: int) -> bool:
-    """Check if port is available"""
-    process = find_process_on_port(port)
-    return process is None
+    # kill_processes() waits for each process to exit, so its sockets are gone
+    return {port: pid for port, pid in listening.items() if pid not in killed_pids}
+
+def check_port_availability(port: int, listening: Optional[Dict[int, Optional[int]]] = None) -> bool:
+    """Check if port is available
 
-def install_dependencies():
-    """Install missing dependencies automatically"""
+    Args:
+        port: Port to check
+        listening: Port -> PID map from an earlier scan; scans again if omitted
+    """
+    # Any listener counts, including ones with an unknown (None) owner.
+    # Only the owning PID matters here, so no psutil.Process is created
+    if listening is None:
+        listening = get_listening_pids()
+    return port not in listening
+
+def requirement_specs(packages: List[str]) -> List[str]:
+    """Map package names to their requirements.txt lines, keeping version pins"""
+    specs = {}
+    try:
+        with open('requirements.txt', 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    name = re.split(r'[<>=!~;\[\s]', line, 1)[0].lower()
+                    specs[name] = line
+    except OSError:
+        pass
+    return [specs.get(package.lower(), package) for package in packages]
+
+def install_dependencies(packages: List[str]):
+    """Install missing dependencies automatically
+
+    Only the given packages are handed to pip, so a single missing package
+    does not re-resolve all of requirements.txt.
+    """
     print(f"  {ARROW} Installing missing dependencies...")
-    start_time = time.time()
+    start_time = time.monotonic()
 
-    logger.info("Starting automatic dependency installation", {"source_file": "requirements.txt"})
+    specs = requirement_specs(packages)
+    logger.info("Starting automatic dependency installation", {"packages": specs})
 
     try:
-        # Install all requirements from requirements.txt
+        command = [sys.executable, '-m', 'pip', 'install', '--quiet',
+                   '--disable-pip-version-check', '--no-input', *specs]
         logger.debug("Running pip install command", {
-            "command": f"{sys.executable} -m pip install -r requirements.txt",
+            "command": ' '.join(command),
             "timeout": 300
         })
 
         result = subprocess.run(
-            [sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt', '--quiet'],
+            command,
             capture_output=True,
             text=True,
             timeout=300  # 5 minute timeout
         )
 
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
 
         if result.returncode == 0:
             print(f"  {CHECK} Dependencies installed successfully")
@@ -368,66 +745,72 @@ def install_dependencies():
         print(f"  {CROSS} Installation timed out")
         logger.error("Dependency installation timed out", {
             "timeout": 300,
-            "duration": time.time() - start_time
+            "duration": time.monotonic() - start_time
         })
         return False
     except Exception as e:
         print(f"  {CROSS} Error installing dependencies: {e}")
         logger.exception("Unexpected error during dependency installation", e, {
-            "duration": time.time() - start_time
+            "duration": time.monotonic() - start_time
         })
         return False
 
+# Packages checked at startup
+REQUIRED_PACKAGES = ('fastapi', 'uvicorn', 'requests', 'pydantic', 'python-dotenv', 'psutil')
+OPTIONAL_PACKAGES = ('twilio', 'python-telegram-bot')
+
+# Mapping of package names to import names (when they differ)
+IMPORT_NAMES = {
+    'python-dotenv': 'dotenv',
+    'python-telegram-bot': 'telegram',
+    'python-multipart': 'multipart'
+}
+
+def import_name_for(package: str) -> str:
+    """Get the module name a package is imported as"""
+    return IMPORT_NAMES.get(package, package.replace('-', '_'))
+
+def is_module_available(import_name: str) -> bool:
+    """Check if a module can be imported, without importing (executing) it"""
+    try:
+        return importlib.util.find_spec(import_name) is not None
+    except (ImportError, ValueError):
+        return False
+
 def check_dependencies():
     """Check if required dependencies are installed"""
     print_section("Checking Dependencies")
-    start_time = time.time()
+    start_time = time.monotonic()
 
     logger.info("Starting dependency check", {"category": "system"})
 
-    required = ['fastapi', 'uvicorn', 'requests', 'pydantic', 'python-dotenv', 'psutil']
-    optional = ['twilio', 'python-telegram-bot']
-
-    # Mapping of package names to import names (when they differ)
-    import_names = {
-        'python-dotenv': 'dotenv',
-        'python-telegram-bot': 'telegram',
-        'python-multipart': 'multipart'
-    }
-
     missing_required = []
     missing_optional = []
 
-    for package in required:
-        try:
-            # Get the correct import name
-            import_name = import_names.get(package, package.replace('-', '_'))
-            __import__(import_name)
+    for package in REQUIRED_PACKAGES:
+        import_name = import_name_for(package)
+        if is_module_available(import_name):
             print(f"  {CHECK} {package}")
-            logger.debug(f"Package {package} found", {"package": package, "import_name": import_name})
-        except ImportError as e:
+            logger.debug(f"Package {package} found", lambda: {"package": package, "import_name": import_name})
+        else:
             print(f"  {CROSS} {package} (REQUIRED - missing)")
             missing_required.append(package)
             logger.warn(f"Required package {package} missing", {
                 "package": package,
-                "import_name": import_name,
-                "error": str(e)
+                "import_name": import_name
             })
 
-    for package in optional:
-        try:
-            # Get the correct import name
-            import_name = import_names.get(package, package.replace('-', '_'))
-            __import__(import_name)
+    for package in OPTIONAL_PACKAGES:
+        import_name = import_name_for(package)
+        if is_module_available(import_name):
             print(f"  {CHECK} {package}")
-            logger.debug(f"Optional package {package} found", {"package": package, "import_name": import_name})
-        except ImportError as e:
+            logger.debug(f"Optional package {package} found", lambda: {"package": package, "import_name": import_name})
+        else:
             print(f"  {WARN} {package} (optional - missing)")
             missing_optional.append(package)
-            logger.debug(f"Optional package {package} missing", {
+            logger.debug(f"Optional package {package} missing", lambda: {
                 "package": package,
-                "import_name": import_name,
-                "error": str(e)
+                "import_name": import_name
             })
 
     if missing_required or missing_optional:
@@ -449,7 +832,7 @@ def check_dependencies():
         print(f"{ARROW} Attempting automatic installation...")
         logger.info("Attempting automatic dependency installation")
 
-        if install_dependencies():
+        if install_dependencies(missing_required + missing_optional):
             print(f"{CHECK} All dependencies installed!")
             print()
 
@@ -457,34 +840,27 @@ def check_dependencies():
             print(f"{ARROW} Verifying installation...")
             logger.debug("Verifying installed dependencies")
 
-            # Mapping of package names to import names
-            import_names = {
-                'python-dotenv': 'dotenv',
-                'python-telegram-bot': 'telegram',
-                'python-multipart': 'multipart'
-            }
-
             all_good = True
             verified = []
             still_missing = []
 
+            # Let the import system see the freshly installed packages
+            importlib.invalidate_caches()
+
             for package in missing_required:
-                try:
-                    import_name = import_names.get(package, package.replace('-', '_'))
-                    __import__(import_name)
+                if is_module_available(import_name_for(package)):
                     print(f"  {CHECK} {package} verified")
                     verified.append(package)
-                    logger.debug(f"Package {package} verified after installation", {"package": package})
-                except ImportError as e:
+                    logger.debug(f"Package {package} verified after installation", lambda: {"package": package})
+                else:
                     print(f"  {CROSS} {package} still missing")
                     still_missing.append(package)
                     logger.error(f"Package {package} still missing after installation", {
-                        "package": package,
-                        "error": str(e)
+                        "package": package
                     })
                     all_good = False
 
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
             logger.performance("Dependency check completed", duration, {
                 "verified": verified,
                 "still_missing": still_missing,
@@ -507,10 +883,10 @@ def check_dependencies():
             logger.fatal("Automatic dependency installation failed")
             sys.exit(1)
     else:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         logger.performance("All dependencies satisfied", duration, {
-            "required_count": len(required),
-            "optional_count": len(optional)
+            "required_count": len(REQUIRED_PACKAGES),
+            "optional_count": len(OPTIONAL_PACKAGES)
         })
 
 def check_configuration():
@@ -518,34 +894,30 @@ def check_configuration():
     print_section("Checking Configuration")
 
     # Check for .env file
-    if Path('.env').exists():
+    if _has_env_file():
         print(f"  {CHECK} .env file found")
     else:
         print(f"  {WARN} .env file not found (optional)")
 
-    # Check Telegram configuration
-    from dotenv import load_dotenv
-    load_dotenv()
+    s = settings()
+    configured = configured_services()
 
-    telegram_token = os.getenv('TELEGRAM_BOT_TOKEN') or config.get('telegram_bot_token')
-    if telegram_token:
+    # Check Telegram configuration
+    if configured['telegram']:
         print(f"  {CHECK} Telegram bot configured")
     else:
         print(f"  {WARN} Telegram bot not configured (will skip)")
         SERVICES['telegram']['required'] = False
 
     # Check SMS configuration
-    twilio_sid = os.getenv('TWILIO_ACCOUNT_SID') or config.get('twilio_account_sid')
-    twilio_token = os.getenv('TWILIO_AUTH_TOKEN') or config.get('twilio_auth_token')
-    if twilio_sid and twilio_token:
+    if configured['sms']:
         print(f"  {CHECK} SMS server configured")
     else:
         print(f"  {WARN} SMS server not configured (will skip)")
         SERVICES['sms']['required'] = False
 
     # Check OpenRouter/Ollama
-    openrouter_key = os.getenv('OPENROUTER_API_KEY') or config.get('openrouter_api_key')
-    if openrouter_key:
+    if s['openrouter_api_key']:
         print(f"  {CHECK} OpenRouter API key configured")
     else:
         print(f"  {WARN} OpenRouter API key not configured")
@@ -555,7 +927,7 @@ def start_service(service_name: str, service_info: Dict) -> Optional[subprocess.
     script = service_info['script']
     name = service_info['name']
     port = service_info['port']
-    start_time = time.time()
+    start_time = time.monotonic()
 
     print(f"  {ARROW} Starting {name} (port {port})...")
     logger.info(f"Starting service: {name}", {
@@ -576,10 +948,15 @@ def start_service(service_name: str, service_info: Dict) -> Optional[subprocess.
         # Services write their own logs, and capturing causes crashes when buffers fill
         process = subprocess.Popen(
             [sys.executable, script],
+            # Hand over the parsed config so the service skips re-reading it
+            env={**os.environ, CONFIG_BLOB_ENV: json.dumps(config)},
             stdout=None,  # Let output go to console
             stderr=None,  # Let errors go to console
-            text=True,
-            bufsize=1,
+            # close_fds=False keeps Popen on its posix_spawn() fast path on
+            # Linux (no fork of this process); Python's own descriptors are
+            # non-inheritable, so nothing extra leaks into the child.
+            # Adding preexec_fn or start_new_session would force a fork again
+            close_fds=False,
             creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if sys.platform == 'win32' else 0
         )
 
@@ -588,13 +965,16 @@ def start_service(service_name: str, service_info: Dict) -> Optional[subprocess.
             "service": service_name
         })
 
-        # Wait for startup
-        startup_delay = service_info.get('startup_delay', 3)
-        logger.trace(f"Waiting {startup_delay}s for {name} startup", {
-            "delay": startup_delay,
+        # Wait until the service answers its health check (or dies)
+        startup_timeout = service_info.get('startup_timeout', 15)
+        health_check = service_info.get('health_check')
+        logger.trace(f"Waiting up to {startup_timeout}s for {name} startup", {
+            "timeout": startup_timeout,
             "service": service_name
         })
-        time.sleep(startup_delay)
+        if health_check:
+            logger.debug(f"Running health check for {name}", {"service": service_name, "port": port})
+            health_ok = wait_ready(process, lambda: health_check(port), deadline=startup_timeout)
 
         # Check if process is still running
         if process.poll() is not None:
@@ -605,19 +985,15 @@ def start_service(service_name: str, service_info: Dict) -> Optional[subprocess.
                 "pid": process.pid,
                 "return_code": process.returncode,
                 "note": "Check console output above for error details",
-                "duration": time.time() - start_time
+                "duration": time.monotonic() - start_time
             })
             return None
 
-        # Check health if available
-        health_check = service_info.get('health_check')
+        # Report health if available
         if health_check:
-            logger.debug(f"Running health check for {name}", {"service": service_name, "port": port})
-            health_ok = health_check(port)
-
             if health_ok:
                 print(f"  {CHECK} {name} started successfully (PID {process.pid})")
-                duration = time.time() - start_time
+                duration = time.monotonic() - start_time
                 logger.performance(f"Service {name} started successfully", duration, {
                     "service": service_name,
                     "pid": process.pid,
@@ -630,11 +1006,11 @@ def start_service(service_name: str, service_info: Dict) -> Optional[subprocess.
                     "service": service_name,
                     "pid": process.pid,
                     "port": port,
-                    "duration": time.time() - start_time
+                    "duration": time.monotonic() - start_time
                 })
         else:
             print(f"  {CHECK} {name} started (PID {process.pid})")
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
             logger.performance(f"Service {name} started", duration, {
                 "service": service_name,
                 "pid": process.pid,
@@ -650,96 +1026,135 @@ def start_service(service_name: str, service_info: Dict) -> Optional[subprocess.
             "service": service_name,
             "script": script,
             "port": port,
-            "duration": time.time() - start_time
+            "duration": time.monotonic() - start_time
         })
         return None
 
-def start_all_services():
-    """Start all services in correct order"""
-    print_section("Starting Services")
-
-    # Start order: LLM Server -> Middleware -> Telegram/SMS (parallel)
-    start_order = ['llm_server', 'middleware', 'telegram', 'sms']
-
-    for service_name in start_order:
-        service_info = SERVICES[service_name]
+def should_start_service(service_name: str, listening: Dict[int, Optional[int]]) -> bool:
+    """Check configuration and port before starting a service
 
-        # Skip if not required and not configured
-        if not service_info['required']:
-            # Double check configuration
-            if service_name == 'telegram':
-                from dotenv import load_dotenv
-                load_dotenv()
-                if not (os.getenv('TELEGRAM_BOT_TOKEN') or config.get('telegram_bot_token')):
-                    print(f"  {WARN} Skipping {service_info['name']} (not configured)")
-                    continue
-            elif service_name == 'sms':
-                from dotenv import load_dotenv
-                load_dotenv()
-                twilio_sid = os.getenv('TWILIO_ACCOUNT_SID') or config.get('twilio_account_sid')
-                twilio_token = os.getenv('TWILIO_AUTH_TOKEN') or config.get('twilio_auth_token')
-                if not (twilio_sid and twilio_token):
-                    print(f"  {WARN} Skipping {service_info['name']} (not configured)")
-                    continue
+    Exits the launcher if a required service cannot be started.
+    """
+    service_info = SERVICES[service_name]
 
-        # Check port availability
-        port = service_info['port']
-        if not check_port_availability(port):
-            print(f"  {CROSS} Port {port} is still in use!")
-            if service_info['required']:
-                print(f"      Cannot start {service_info['name']} - exiting")
-                cleanup_on_exit()
-                sys.exit(1)
-            else:
-                print(f"      Skipping {service_info['name']}")
-                continue
+    # Skip if not required and not configured
+    if not service_info['required'] and not configured_services().get(service_name, True):
+        print(f"  {WARN} Skipping {service_info['name']} (not configured)")
+        return False
 
-        # Start service
-        process = start_service(service_name, service_info)
-        if process:
-            running_processes[service_name] = process
-
-            # Special handling for LLM server: reload config to get dynamically assigned port
-            if service_name == 'llm_server':
-                logger.debug("Reloading config after LLM server startup to get assigned port")
-                time.sleep(2)  # Give LLM server time to write config
-                try:
-                    with open('config.json', 'r') as f:
-                        updated_config = json.load(f)
-                    new_port = updated_config.get('llm_server_port')
-                    if new_port and new_port != service_info['port']:
-                        logger.info(f"LLM server port updated: {service_info['port']} -> {new_port}", {
-                            "old_port": service_info['port'],
-                            "new_port": new_port
-                        })
-                        # Update global config and service info
-                        config['llm_server_port'] = new_port
-                        SERVICES['llm_server']['port'] = new_port
-                        print(f"  {ARROW} Port updated to {new_port}")
-                except Exception as e:
-                    logger.error(f"Failed to reload config after LLM server start: {e}")
-
-        elif service_info['required']:
-            print(f"  {CROSS} Required service {service_info['name']} failed to start - exiting")
+    # Check port availability
+    port = service_info['port']
+    if not check_port_availability(port, listening):
+        print(f"  {CROSS} Port {port} is still in use!")
+        if service_info['required']:
+            print(f"      Cannot start {service_info['name']} - exiting")
             cleanup_on_exit()
             sys.exit(1)
+        else:
+            print(f"      Skipping {service_info['name']}")
+            return False
+
+    return True
+
+def record_started_service(service_name: str, process: Optional[subprocess.Popen]):
+    """Track a started service, or exit if a required service failed"""
+    service_info = SERVICES[service_name]
+
+    if process:
+        running_processes[service_name] = process
+
+        # Special handling for LLM server: reload config to get dynamically assigned port
+        if service_name == 'llm_server':
+            # start_service waited until the server answered, so any port it
+            # picked has already been written
+            logger.debug("Reloading config after LLM server startup to get assigned port")
+            try:
+                st = os.stat('config.json')
+                if (st.st_mtime_ns, st.st_size) == config_stamp:
+                    # Untouched since load_config(), so the port is unchanged
+                    return
+                with open('config.json', 'r') as f:
+                    updated_config = json.load(f)
+                new_port = updated_config.get('llm_server_port')
+                if new_port and new_port != service_info['port']:
+                    logger.info(f"LLM server port updated: {service_info['port']} -> {new_port}", {
+                        "old_port": service_info['port'],
+                        "new_port": new_port
+                    })
+                    # Update global config and service info
+                    config['llm_server_port'] = new_port
+                    SERVICES['llm_server']['port'] = new_port
+                    print(f"  {ARROW} Port updated to {new_port}")
+            except Exception as e:
+                logger.error(f"Failed to reload config after LLM server start: {e}")
+
+    elif service_info['required']:
+        print(f"  {CROSS} Required service {service_info['name']} failed to start - exiting")
+        cleanup_on_exit()
+        sys.exit(1)
+
+def start_all_services(listening: Optional[Dict[int, Optional[int]]] = None):
+    """Start all services in correct order
+
+    Args:
+        listening: Port -> PID map returned by cleanup_existing_processes()
+    """
+    print_section("Starting Services")
+
+    if listening is None:
+        listening = get_listening_pids()
+
+    # Start order: LLM Server -> Middleware, then Telegram/SMS in parallel
+    # (they only talk to the other services once messages arrive)
+    sequential = ['llm_server', 'middleware']
+    parallel = ['telegram', 'sms']
+
+    for service_name in sequential:
+        if should_start_service(service_name, listening):
+            record_started_service(service_name, start_service(service_name, SERVICES[service_name]))
+            if service_name in running_processes:
+                listening[SERVICES[service_name]['port']] = running_processes[service_name].pid
+
+    to_start = [service_name for service_name in parallel if should_start_service(service_name, listening)]
+    if not to_start:
+        return
+
+    # Processes are recorded from this thread, so running_processes needs no lock
+    with ThreadPoolExecutor(max_workers=len(to_start)) as executor:
+        futures = {
+            executor.submit(start_service, service_name, SERVICES[service_name]): service_name
+            for service_name in to_start
+        }
+        for future in as_completed(futures):
+            record_started_service(futures[future], future.result())
+
+# print_status() line per service state, with the status symbol filled in
+STATUS_LINES = {
+    'running': f"  {CHECK} {{name:20}} - Running (PID {{pid}}, Port {{port}})",
+    'not_responding': f"  {WARN} {{name:20}} - Running but not responding (PID {{pid}}, Port {{port}})",
+    'stopped': f"  {CROSS} {{name:20}} - Stopped unexpectedly",
+    'not_started': f"  {WARN} {{name:20}} - Not started",
+}
 
 def print_status():
     """Print status of all services"""
     print_section("Service Status")
 
+    healthy = probe_services(list(running_processes))
+
     for service_name, service_info in SERVICES.items():
-        name = service_info['name']
-        port = service_info['port']
+        fields = {'name': service_info['name'], 'port': service_info['port']}
 
-        if service_name in running_processes:
-            process = running_processes[service_name]
-            if process.poll() is None:
-                print(f"  {CHECK} {name:20} - Running (PID {process.pid}, Port {port})")
-            else:
-                print(f"  {CROSS} {name:20} - Stopped unexpectedly")
+        process = running_processes.get(service_name)
+        if process is None:
+            state = 'not_started'
+        elif process.poll() is not None:
+            state = 'stopped'
         else:
-            print(f"  {WARN} {name:20} - Not started")
+            fields['pid'] = process.pid
+            state = 'running' if healthy.get(service_name, True) else 'not_responding'
+
+        print(STATUS_LINES[state].format_map(fields))
 
 def print_urls():
     """Print service URLs"""
@@ -807,23 +1222,32 @@ def monitor_services():
     print("Press Ctrl+C to stop all services")
     print()
 
-    monitor_start = time.time()
+    monitor_start = time.monotonic()
     health_check_count = 0
 
+    watcher = ExitWatcher(list(running_processes.values()))
+
+    # (service_name, process, service_info) for each running service; only
+    # rebuilt when a service stops
+    monitored = [
+        (service_name, process, SERVICES[service_name])
+        for service_name, process in running_processes.items()
+    ]
+
     try:
         while True:
-            time.sleep(5)
+            watcher.wait(MONITOR_INTERVAL)
             health_check_count += 1
 
-            logger.trace(f"Health check #{health_check_count}", {
+            logger.trace(f"Health check #{health_check_count}", lambda: {
                 "running_services": list(running_processes.keys()),
-                "uptime": time.time() - monitor_start
+                "uptime": time.monotonic() - monitor_start
             })
 
             # Check if any process died
-            for service_name, process in list(running_processes.items()):
+            stopped = False
+            for service_name, process, service_info in monitored:
                 if process.poll() is not None:
-                    service_info = SERVICES[service_name]
                     print(f"\n{CROSS} {service_info['name']} stopped unexpectedly!")
 
                     # Get exit information
@@ -832,7 +1256,7 @@ def monitor_services():
                         "service": service_name,
                         "pid": process.pid,
                         "return_code": return_code,
-                        "uptime": time.time() - monitor_start,
+                        "uptime": time.monotonic() - monitor_start,
                         "health_checks_completed": health_check_count
                     })
 
@@ -850,12 +1274,16 @@ def monitor_services():
                             "continuing": True
                         })
                         del running_processes[service_name]
+                        stopped = True
+
+            if stopped:
+                monitored = [entry for entry in monitored if entry[0] in running_processes]
 
             # Exit if all processes are dead
             if not running_processes:
                 print(f"\n{CROSS} All services stopped - exiting")
                 logger.error("All services stopped unexpectedly", {
-                    "uptime": time.time() - monitor_start,
+                    "uptime": time.monotonic() - monitor_start,
                     "health_checks": health_check_count
                 })
                 break
@@ -863,14 +1291,29 @@ def monitor_services():
     except KeyboardInterrupt:
         print("\n\nShutdown requested...")
         logger.info("Monitoring interrupted by user", {
-            "uptime": time.time() - monitor_start,
+            "uptime": time.monotonic() - monitor_start,
             "health_checks": health_check_count
         })
+    finally:
+        watcher.close()
+
+# Seconds services get to shut down gracefully before being killed
+STOP_TIMEOUT = 5
+
+_cleanup_done = False
 
 def cleanup_on_exit():
-    """Cleanup function to stop all services"""
+    """Cleanup function to stop all services (only the first call does anything)"""
+    global _cleanup_done
+    if _cleanup_done:
+        return
+    _cleanup_done = True
+
+    # A second Ctrl+C must not interrupt the shutdown half way
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
     print_section("Stopping Services")
-    cleanup_start = time.time()
+    cleanup_start = time.monotonic()
 
     logger.info("Starting cleanup process", {
         "services_to_stop": list(running_processes.keys()),
@@ -881,12 +1324,13 @@ def cleanup_on_exit():
     force_killed_count = 0
     errors = []
 
+    # Signal every service first so their shutdowns overlap
+    stopping = []
     for service_name, process in running_processes.items():
         service_info = SERVICES[service_name]
         if process.poll() is None:
-            service_stop_start = time.time()
             print(f"  {ARROW} Stopping {service_info['name']}...")
-            logger.debug(f"Stopping service {service_info['name']}", {
+            logger.debug(f"Stopping service {service_info['name']}", lambda: {
                 "service": service_name,
                 "pid": process.pid
             })
@@ -896,31 +1340,10 @@ def cleanup_on_exit():
                     process.send_signal(signal.CTRL_BREAK_EVENT)
                 else:
                     process.terminate()
-
-                process.wait(timeout=5)
-                stop_duration = time.time() - service_stop_start
-                print(f"  {CHECK} {service_info['name']} stopped")
-                logger.info(f"Service {service_info['name']} stopped gracefully", {
-                    "service": service_name,
-                    "pid": process.pid,
-                    "stop_duration": stop_duration
-                })
-                stopped_count += 1
-
-            except subprocess.TimeoutExpired:
-                process.kill()
-                stop_duration = time.time() - service_stop_start
-                print(f"  {WARN} {service_info['name']} force killed")
-                logger.warn(f"Service {service_info['name']} force killed after timeout", {
-                    "service": service_name,
-                    "pid": process.pid,
-                    "timeout": 5,
-                    "stop_duration": stop_duration
-                })
-                force_killed_count += 1
+                stopping.append((service_name, process, service_info))
 
             except Exception as e:
-                stop_duration = time.time() - service_stop_start
+                stop_duration = time.monotonic() - cleanup_start
                 print(f"  {CROSS} Error stopping {service_info['name']}: {e}")
                 logger.error(f"Error stopping service {service_info['name']}", {
                     "service": service_name,
@@ -931,7 +1354,41 @@ def cleanup_on_exit():
                 })
                 errors.append({"service": service_name, "error": str(e)})
 
-    cleanup_duration = time.time() - cleanup_start
+    # One shared grace period for all of them, then force kill stragglers
+    deadline = time.monotonic() + STOP_TIMEOUT
+    while stopping:
+        still_running = []
+        for service_name, process, service_info in stopping:
+            if process.poll() is None:
+                still_running.append((service_name, process, service_info))
+                continue
+            stop_duration = time.monotonic() - cleanup_start
+            print(f"  {CHECK} {service_info['name']} stopped")
+            logger.info(f"Service {service_info['name']} stopped gracefully", {
+                "service": service_name,
+                "pid": process.pid,
+                "stop_duration": stop_duration
+            })
+            stopped_count += 1
+
+        stopping = still_running
+        if not stopping or time.monotonic() >= deadline:
+            break
+        time.sleep(0.1)
+
+    for service_name, process, service_info in stopping:
+        process.kill()
+        stop_duration = time.monotonic() - cleanup_start
+        print(f"  {WARN} {service_info['name']} force killed")
+        logger.warn(f"Service {service_info['name']} force killed after timeout", {
+            "service": service_name,
+            "pid": process.pid,
+            "timeout": STOP_TIMEOUT,
+            "stop_duration": stop_duration
+        })
+        force_killed_count += 1
+
+    cleanup_duration = time.monotonic() - cleanup_start
     print()
     print(f"{CHECK} All services stopped")
 
@@ -949,7 +1406,7 @@ def cleanup_on_exit():
 
 def main():
     """Main launcher function"""
-    launch_start_time = time.time()
+    launch_start_time = time.monotonic()
     logger.info("=== LLM Trainer System Launcher Started ===", {
         "python_version": sys.version,
         "platform": sys.platform,
@@ -969,18 +1426,18 @@ def main():
 
         # Step 3: Cleanup existing processes
         logger.info("Step 3: Cleaning up existing processes")
-        cleanup_existing_processes()
+        listening = cleanup_existing_processes()
 
         # Step 4: Start all services
         logger.info("Step 4: Starting all services")
-        start_all_services()
+        start_all_services(listening)
 
         # Step 5: Print status
         logger.info("Step 5: Displaying service status")
         print_status()
         print_urls()
 
-        launch_duration = time.time() - launch_start_time
+        launch_duration = time.monotonic() - launch_start_time
         logger.performance("System launcher completed", launch_duration, {
             "services_started": len(running_processes),
             "service_list": list(running_processes.keys())
@@ -998,7 +1455,7 @@ def main():
         logger.info("Step 7: Cleaning up")
         cleanup_on_exit()
 
-        total_duration = time.time() - launch_start_time
+        total_duration = time.monotonic() - launch_start_time
         logger.info("=== LLM Trainer System Launcher Exited ===", {
             "total_duration": total_duration,
             "exit_reason": "normal"
@@ -1006,7 +1463,7 @@ def main():
 
     except Exception as e:
         logger.exception("Fatal error in main launcher", e, {
-            "duration": time.time() - launch_start_time
+            "duration": time.monotonic() - launch_start_time
         })
         raise
 
@@ -6,9 +6,12 @@ Quick Start Script for Training
 Starts all services and begins training in one command.
 """
 
+import atexit
+import os
 import subprocess
 import sys
 import time
+import select
 import signal
 from pathlib import Path
 
@@ -17,28 +20,85 @@ CHECK = "[OK]"
 CROSS = "[X]"
 
 # Check and install dependencies FIRST (before other imports)
-try:
-    from check_dependencies import check_and_install_dependencies
+# Set SKIP_DEP_CHECK=1 to skip the check on restarts
+if os.getenv('SKIP_DEP_CHECK') != '1':
+    try:
+        from check_dependencies import check_and_install_dependencies
 
-    print("Checking dependencies before starting...")
-    print("")
+        print("Checking dependencies before starting...")
+        print("")
 
-    if not check_and_install_dependencies(auto_install=True):
-        print(f"{CROSS} Dependency installation failed.")
-        print("Please install manually: pip install -r requirements.txt")
-        sys.exit(1)
+        if not check_and_install_dependencies(auto_install=True):
+            print(f"{CROSS} Dependency installation failed.")
+            print("Please install manually: pip install -r requirements.txt")
+            sys.exit(1)
 
-except ImportError:
-    print("Warning: Dependency checker not found, skipping auto-install")
-    print("")
+    except ImportError:
+        print("Warning: Dependency checker not found, skipping auto-install")
+        print("")
 
 # Now import other required modules
 import json
 import requests
 
+try:
+    import orjson
+except ImportError:  # Optional - falls back to the stdlib json module
+    orjson = None
+
+CONFIG_PATH = Path('config.json')
+
+# One keep-alive session for every request this script makes (readiness
+# probes, training start and status), so each reuses a pooled connection
+SESSION = requests.Session()
+SESSION.mount('http://', requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8))
+atexit.register(SESSION.close)
+
+
+def read_config():
+    """Parse config.json (with orjson when it is installed)"""
+    data = CONFIG_PATH.read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def write_config(config_data):
+    """Write config.json with the same 2-space indentation as json.dump"""
+    if orjson is not None:
+        CONFIG_PATH.write_bytes(orjson.dumps(config_data, option=orjson.OPT_INDENT_2))
+    else:
+        CONFIG_PATH.write_text(json.dumps(config_data, indent=2))
+
+
 # Load config
-with open('config.json', 'r') as f:
-    config = json.load(f)
+config = read_config()
+
+
+def config_stamp():
+    """(mtime_ns, size) of config.json, or None if it cannot be read"""
+    try:
+        st = CONFIG_PATH.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def report_progress(status):
+    """Print one training status update
+
+    Returns:
+        True once training has finished
+    """
+    if not status.get('running'):
+        print(f"\n{CHECK} Training completed!")
+        print(f"  Total exchanges: {status.get('exchanges_completed')}")
+        return True
+
+    topic = status.get('current_topic', 'N/A')
+    topic_short = topic[:50] + '...' if len(topic) > 50 else topic
+
+    print(f"Progress: {status.get('exchanges_completed')} exchanges | "
+          f"Topic: {topic_short}")
+    return False
 
 
 class ServiceManager:
@@ -47,6 +107,20 @@ class ServiceManager:
     def __init__(self):
         self.processes = []
         self.log_files = []  # Track log files to close later
+        self.stopped = False
+
+        # Read end of a self-pipe the interpreter writes to on SIGCHLD
+        # (signal.set_wakeup_fd), so init waits end early on a crash without
+        # the handler touching any lock. Windows has no SIGCHLD; there the
+        # waits simply run their full length
+        self.child_exit_fd = None
+        if hasattr(signal, 'SIGCHLD'):
+            read_fd, write_fd = os.pipe()
+            os.set_blocking(read_fd, False)
+            os.set_blocking(write_fd, False)
+            signal.set_wakeup_fd(write_fd)
+            signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+            self.child_exit_fd = read_fd
 
     def start_service(self, script_name, service_name):
         """Start a service subprocess"""
@@ -67,6 +141,10 @@ class ServiceManager:
                 stdin=subprocess.DEVNULL,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
+                # close_fds=False keeps Popen on its posix_spawn() fast path on
+                # Linux (no fork of this process); Python's own descriptors are
+                # non-inheritable, so nothing extra leaks into the child
+                close_fds=False,
                 creationflags=flags
             )
 
@@ -78,34 +156,87 @@ class ServiceManager:
             print(f"{CROSS} Failed to start {service_name}: {e}")
             return None
 
-    def wait_for_service(self, url, timeout=30):
-        """Wait for a service to become available"""
-        start_time = time.time()
+    def sleep_until_child_exit(self, timeout):
+        """Sleep up to timeout seconds, waking early when any child exits"""
+        if self.child_exit_fd is None:
+            time.sleep(timeout)
+            return
+
+        # Any signal wakes the pipe; callers re-check their processes anyway
+        if select.select([self.child_exit_fd], [], [], timeout)[0]:
+            try:
+                while os.read(self.child_exit_fd, 512):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def wait_for_exit(self, timeout):
+        """Wait up to timeout seconds, returning early if a service exits
+
+        Returns:
+            The (service_name, process) that exited, or None
+        """
+        self.sleep_until_child_exit(timeout)
+        for service_name, process in self.processes:
+            if process.poll() is not None:
+                return service_name, process
+        return None
+
+    def wait_for_service(self, url, timeout=30, process=None):
+        """Wait for a service to become available
+
+        Retries with exponential backoff (50ms doubling up to 1s), so a
+        service that comes up quickly is noticed quickly. If the service's
+        process is given, the wait ends as soon as it exits.
+        """
+        deadline = time.monotonic() + timeout
         attempt = 0
+        delay = 0.05
 
-        while time.time() - start_time < timeout:
+        while time.monotonic() < deadline:
             try:
                 attempt += 1
-                # Increased from 2 to 10 seconds to accommodate LLM Server's Ollama health check (5s timeout)
-                response = requests.get(url, timeout=10)
+                # Up to 10 seconds to accommodate LLM Server's Ollama health check (5s timeout)
+                response = SESSION.get(url, timeout=max(0.1, min(10, deadline - time.monotonic())))
                 print(f"  Attempt {attempt}: HTTP {response.status_code}")
                 if response.status_code == 200:
                     return True
             except Exception as e:
                 print(f"  Attempt {attempt}: Connection failed - {type(e).__name__}")
 
-            time.sleep(1)
+            # Sleeps until the next attempt, or until a child exits
+            self.sleep_until_child_exit(delay)
+            if process is not None and process.poll() is not None:
+                print(f"  Process exited with code {process.returncode}")
+                return False
+            delay = min(delay * 2, 1.0)
 
         return False
 
     def stop_all(self):
-        """Stop all services"""
+        """Stop all services (only the first call does anything)"""
+        if self.stopped:
+            return
+        self.stopped = True
+
+        # A second Ctrl+C must not interrupt the shutdown half way
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
         print("\nStopping all services...")
 
+        # Signal every service first, then wait on them against one shared
+        # deadline, so shutdown takes at most 5s however many are hung
         for service_name, process in self.processes:
             try:
                 process.terminate()
-                process.wait(timeout=5)
+            except OSError:
+                pass
+
+        deadline = time.monotonic() + 5
+        for service_name, process in self.processes:
+            try:
+                process.wait(timeout=max(0, deadline - time.monotonic()))
                 print(f"{CHECK} {service_name} stopped")
             except:
                 process.kill()
@@ -128,13 +259,12 @@ def main():
 
     manager = ServiceManager()
 
-    # Setup signal handlers for graceful shutdown
+    # Treat SIGTERM like Ctrl+C: unwind to the finally block below, which
+    # stops the services exactly once from ordinary code rather than from
+    # inside a signal handler
     def signal_handler(sig, frame):
-        print("\n\nShutdown requested...")
-        manager.stop_all()
-        sys.exit(0)
+        raise KeyboardInterrupt
 
-    signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
     try:
@@ -153,8 +283,10 @@ def main():
         # This prevents race condition with stale port values
         if 'llm_server_port' in config:
             del config['llm_server_port']
-            with open('config.json', 'w') as f:
-                json.dump(config, f, indent=2)
+            write_config(config)
+
+        # Taken before the launch so a fast port write is not missed
+        last_stamp = config_stamp()
 
         # Start LLM Server
         llm_process = manager.start_service('llm_server.py', 'LLM Server')
@@ -164,9 +296,10 @@ def main():
         # Wait for LLM Server to write port to config (with retry)
         print("Waiting for LLM Server to initialize and write port to config...")
         llm_port = None
+        deadline = time.monotonic() + 10  # Try for up to 10 seconds
 
-        for attempt in range(10):  # Try for up to 10 seconds
-            time.sleep(1)
+        while time.monotonic() < deadline:
+            manager.wait_for_exit(0.1)
 
             # Check if process is still running
             if llm_process.poll() is not None:
@@ -175,18 +308,25 @@ def main():
                 manager.stop_all()
                 return
 
+            # A stat is cheap; only re-parse config.json once it has been rewritten
+            stamp = config_stamp()
+            if stamp == last_stamp:
+                continue
+            last_stamp = stamp
+
             # Try to reload config
             try:
-                with open('config.json', 'r') as f:
-                    updated_config = json.load(f)
-                    llm_port = updated_config.get('llm_server_port')
+                updated_config = read_config()
+                llm_port = updated_config.get('llm_server_port')
 
                 if llm_port:
                     config.update(updated_config)
                     print(f"{CHECK} LLM Server selected port: {llm_port}")
                     break
             except Exception as e:
-                print(f"Warning: Could not read config on attempt {attempt + 1}: {e}")
+                # Possibly caught mid-write; parse again on the next tick
+                last_stamp = None
+                print(f"Warning: Could not read config: {e}")
 
         if not llm_port:
             print(f"{CROSS} LLM Server did not write port to config after 10 seconds")
@@ -196,12 +336,17 @@ def main():
 
         # Give uvicorn adequate time to initialize after port selection
         print("Giving LLM Server time to initialize uvicorn...")
-        time.sleep(6)  # Increased to 6 seconds for reliability
+        exited = manager.wait_for_exit(6)  # Increased to 6 seconds for reliability
+        if exited:
+            print(f"{CROSS} {exited[0]} process exited unexpectedly with code {exited[1].returncode}")
+            print("  Check llm_server.py logs for details")
+            manager.stop_all()
+            return
 
         # Wait for LLM Server
         print("Waiting for LLM Server...")
         # Use 127.0.0.1 instead of localhost to avoid IPv6 issues
-        if not manager.wait_for_service(f"http://127.0.0.1:{llm_port}/"):
+        if not manager.wait_for_service(f"http://127.0.0.1:{llm_port}/", process=llm_process):
             print(f"{CROSS} LLM Server failed to start")
             print("  Check llm_server.log for details")
             manager.stop_all()
@@ -216,12 +361,17 @@ def main():
             manager.stop_all()
             return
 
-        time.sleep(3)  # Give it time to initialize
+        exited = manager.wait_for_exit(3)  # Give it time to initialize
+        if exited:
+            print(f"{CROSS} {exited[0]} process exited unexpectedly with code {exited[1].returncode}")
+            manager.stop_all()
+            return
 
         # Wait for Middleware
         print("Waiting for Middleware...")
         # Use 127.0.0.1 instead of localhost to avoid IPv6 issues
-        if not manager.wait_for_service(f"http://127.0.0.1:{config['middleware_port']}/api/status"):
+        if not manager.wait_for_service(f"http://127.0.0.1:{config['middleware_port']}/api/status",
+                                        process=middleware_process):
             print(f"{CROSS} Middleware failed to start")
             manager.stop_all()
             return
@@ -236,7 +386,7 @@ def main():
         print("")
 
         # Start training via middleware API
-        response = requests.post(
+        response = SESSION.post(
             f"http://127.0.0.1:{config['middleware_port']}/api/training/start",
             json={
                 "max_exchanges": 100,
@@ -251,27 +401,30 @@ def main():
             print("Monitoring progress (Ctrl+C to stop)...")
             print("")
 
-            # Monitor training
-            while True:
-                time.sleep(5)
-
-                status_response = requests.get(
-                    f"http://127.0.0.1:{config['middleware_port']}/api/training/status"
-                )
-
-                if status_response.status_code == 200:
-                    status = status_response.json()
-
-                    if not status.get('running'):
-                        print("\n{CHECK} Training completed!")
-                        print(f"  Total exchanges: {status.get('exchanges_completed')}")
-                        break
-
-                    topic = status.get('current_topic', 'N/A')
-                    topic_short = topic[:50] + '...' if len(topic) > 50 else topic
-
-                    print(f"Progress: {status.get('exchanges_completed')} exchanges | "
-                          f"Topic: {topic_short}")
+            # Monitor training: middleware pushes an event per exchange over
+            # server-sent events (re-sent every 15s while idle). Identity
+            # encoding keeps GZip from holding events back
+            with SESSION.get(
+                f"http://127.0.0.1:{config['middleware_port']}/api/training/stream",
+                stream=True,
+                timeout=(5, 60),
+                headers={'Accept-Encoding': 'identity'}
+            ) as stream:
+                if stream.status_code == 200:
+                    for line in stream.iter_lines():
+                        if line.startswith(b'data: ') and report_progress(json.loads(line[6:])):
+                            break
+                else:
+                    # Middleware without the stream endpoint: poll instead
+                    while True:
+                        time.sleep(5)
+
+                        status_response = SESSION.get(
+                            f"http://127.0.0.1:{config['middleware_port']}/api/training/status"
+                        )
+
+                        if status_response.status_code == 200 and report_progress(status_response.json()):
+                            break
 
         else:
             print(f"{CROSS} Failed to start training: {response.text}")
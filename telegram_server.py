@@ -13,19 +13,32 @@ Provides Telegram interface to the LLM Server:
 
 import sys
 import json
+import hashlib
+import importlib.util
 import logging
 import os
+import random
 import threading
 import time
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Optional
 from datetime import datetime
 
+from cachetools import TTLCache
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 import uvicorn
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # Optional - falls back to the stdlib json module
+    orjson = None
+
 from messaging_database import MessagingDatabase
 from telegram_service import TelegramService
 
@@ -36,9 +49,26 @@ load_dotenv()
 CHECK = "[OK]"
 CROSS = "[X]"
 
-# Load configuration
-with open('config.json', 'r') as f:
-    config = json.load(f)
+# Load configuration (the launchers hand over their already-parsed copy)
+config_blob = os.environ.get('LLM_TRAINER_CONFIG_BLOB')
+if config_blob:
+    config = orjson.loads(config_blob) if orjson is not None else json.loads(config_blob)
+else:
+    with open('config.json', 'r') as f:
+        config = json.load(f)
+
+# Read-only from here on; everything derived from it is resolved once below
+config = MappingProxyType(config)
+
+BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN') or config.get('telegram_bot_token')
+LLM_URL = f"http://localhost:{config.get('llm_server_port', 8033)}/api/chat"
+MIDDLEWARE_URL = f"http://localhost:{config.get('middleware_port', 8032)}/api/chat"
+
+# Fixed part of every LLM Server request
+LLM_PAYLOAD_TEMPLATE = MappingProxyType({
+    "temperature": 0.8,
+    "max_tokens": 500  # Longer responses for Telegram
+})
 
 # Configure logging
 logging.basicConfig(
@@ -47,11 +77,73 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Requests and replies on the message path are (de)serialized with orjson
+# when it is installed
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Telegram only needs an acknowledgement, so the webhook body is prebuilt
+WEBHOOK_OK = b'{"ok":true}'
+
+
+def json_dumps(obj, sort_keys: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(obj, sort_keys=sort_keys, ensure_ascii=False).encode('utf-8')
+
+
+def json_loads(data: bytes):
+    """Parse UTF-8 JSON, with orjson when it is installed"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
 # Initialize FastAPI
 app = FastAPI(title="Telegram Bot Server", version="1.0.0")
 
-# Initialize database (shared with SMS)
-db = MessagingDatabase()
+# Webhook worker processes (see run_server); polling mode always uses one
+WEBHOOK_WORKERS = config.get('telegram_webhook_workers', 1)
+
+# Message worker threads per process (see message_pool)
+MESSAGE_WORKERS = config.get('telegram_workers', 16)
+
+# Initialize database (shared with SMS). With several worker processes a
+# /setname or /cerebrum handled by one would leave stale user rows cached in
+# the others, so the user cache is only used by a single process
+db = MessagingDatabase(cache_users=WEBHOOK_WORKERS <= 1)
+
+# Keep-alive session for LLM Server / middleware calls, so consecutive
+# messages reuse a pooled localhost connection. Only failed connection
+# attempts are retried (urllib3 does not re-send POSTs after a read error)
+llm_session = requests.Session()
+llm_session.mount('http://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=max(32, MESSAGE_WORKERS),
+    max_retries=Retry(total=2, backoff_factor=0.1)
+))
+
+# Bot API session handed to TelegramService, sized so every message worker
+# plus the polling thread can hold a keep-alive connection at once
+telegram_session = requests.Session()
+telegram_session.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=MESSAGE_WORKERS + 1
+))
+
+# Incoming messages are processed on a bounded pool, which caps how many
+# LLM calls run at once under bursty traffic
+message_pool = ThreadPoolExecutor(
+    max_workers=MESSAGE_WORKERS,
+    thread_name_prefix="tg-msg"
+)
+
+# Exact-match cache of OpenRouter replies, keyed by digest of the
+# conversation context plus the new message
+response_cache: TTLCache = TTLCache(maxsize=4096, ttl=3600)
+response_cache_lock = threading.Lock()
+
+# Assistant replies are stored here while they are sent. A separate pool,
+# so a message worker waiting on its write can never starve message_pool
+history_write_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tg-db")
 
 # Initialize Telegram service (will be configured after startup)
 telegram_service: Optional[TelegramService] = None
@@ -60,6 +152,10 @@ telegram_service: Optional[TelegramService] = None
 polling_active = False
 polling_thread = None
 
+# Retry delay bounds (seconds) after a failed getUpdates call
+POLL_BACKOFF_MIN = 1.0
+POLL_BACKOFF_MAX = 30.0
+
 
 def init_telegram_service() -> bool:
     """
@@ -70,15 +166,12 @@ def init_telegram_service() -> bool:
     """
     global telegram_service
 
-    # Get bot token from environment or config
-    bot_token = os.getenv('TELEGRAM_BOT_TOKEN') or config.get('telegram_bot_token')
-
-    if not bot_token:
+    if not BOT_TOKEN:
         logger.error("Telegram bot token not configured")
         return False
 
     try:
-        telegram_service = TelegramService(bot_token)
+        telegram_service = TelegramService(BOT_TOKEN, session=telegram_session)
 
         # Validate connection
         is_valid, message = telegram_service.validate_connection()
@@ -107,9 +200,27 @@ def get_llm_response(user_message: str, conversation_history: list, backend: str
         AI response or None if failed
     """
     if backend == 'cerebrum':
+        # Never cached - every message is live input CEREBRUM learns from
         return get_cerebrum_response(user_message, conversation_history)
-    else:
-        return get_openrouter_response(user_message, conversation_history)
+
+    key = response_cache_key(user_message, conversation_history)
+    with response_cache_lock:
+        cached = response_cache.get(key)
+    if cached is not None:
+        logger.info("Using cached OpenRouter response")
+        return cached
+
+    ai_response = get_openrouter_response(user_message, conversation_history)
+    if ai_response:
+        with response_cache_lock:
+            response_cache[key] = ai_response
+    return ai_response
+
+
+def response_cache_key(user_message: str, conversation_history: list) -> bytes:
+    """Digest of the exact context an OpenRouter reply depends on"""
+    context = json_dumps([conversation_history, user_message], sort_keys=True)
+    return hashlib.blake2b(context, digest_size=16).digest()
 
 
 def get_openrouter_response(user_message: str, conversation_history: list) -> Optional[str]:
@@ -124,22 +235,20 @@ def get_openrouter_response(user_message: str, conversation_history: list) -> Op
         AI response or None if failed
     """
     try:
-        llm_server_port = config.get('llm_server_port', 8033)
-        llm_url = f"http://localhost:{llm_server_port}/api/chat"
-
         payload = {
+            **LLM_PAYLOAD_TEMPLATE,
             "message": user_message,
-            "conversation_history": conversation_history,
-            "temperature": 0.8,
-            "max_tokens": 500  # Longer responses for Telegram
+            "conversation_history": conversation_history
         }
 
-        logger.info(f"Calling LLM Server (OpenRouter) at {llm_url}")
+        logger.info(f"Calling LLM Server (OpenRouter) at {LLM_URL}")
 
-        response = requests.post(llm_url, json=payload, timeout=60)
+        response = llm_session.post(
+            LLM_URL, data=json_dumps(payload), headers=JSON_HEADERS, timeout=60
+        )
 
         if response.status_code == 200:
-            data = response.json()
+            data = json_loads(response.content)
             ai_response = data.get('response', '')
             logger.info(f"Got OpenRouter response: {ai_response[:60]}...")
             return ai_response
@@ -167,20 +276,19 @@ def get_cerebrum_response(user_message: str, conversation_history: list) -> Opti
         AI response or None if failed
     """
     try:
-        middleware_port = config.get('middleware_port', 8032)
-        middleware_url = f"http://localhost:{middleware_port}/api/chat"
-
         payload = {
             "message": user_message,
             "user_id": "telegram_bot"
         }
 
-        logger.info(f"Calling CEREBRUM via Middleware at {middleware_url}")
+        logger.info(f"Calling CEREBRUM via Middleware at {MIDDLEWARE_URL}")
 
-        response = requests.post(middleware_url, json=payload, timeout=60)
+        response = llm_session.post(
+            MIDDLEWARE_URL, data=json_dumps(payload), headers=JSON_HEADERS, timeout=60
+        )
 
         if response.status_code == 200:
-            data = response.json()
+            data = json_loads(response.content)
             cerebrum_response = data.get('response', '')
             logger.info(f"Got CEREBRUM response: {cerebrum_response[:60]}...")
             return cerebrum_response
@@ -222,29 +330,9 @@ def process_telegram_message(chat_id: str, text: str, username: str = None, full
             return
 
         # Check if this is a name command
-        if TelegramService.is_name_command(text):
-            name = TelegramService.parse_name_command(text)
-
-            if not name:
-                telegram_service.send_message(
-                    chat_id,
-                    "Please provide a valid name. Use: `/setname <your name>`"
-                )
-                return
-
-            # Check if user exists
-            user = db.get_user(chat_id, 'telegram')
-
-            if user:
-                # Update existing name
-                db.update_user_name(chat_id, name, 'telegram')
-                response_text = TelegramService.format_name_updated_message(name)
-            else:
-                # Create new user
-                db.create_user(chat_id, 'telegram', name, username)
-                response_text = TelegramService.format_name_registered_message(name)
-
-            telegram_service.send_message(chat_id, response_text)
+        name = TelegramService.parse_name_command(text)
+        if name:
+            set_user_name(chat_id, name, username)
 
         else:
             # Regular message - check if user is registered
@@ -254,7 +342,7 @@ def process_telegram_message(chat_id: str, text: str, username: str = None, full
                 # User not registered or no name
                 # Use Telegram first name if available
                 if full_name:
-                    db.create_user(chat_id, 'telegram', full_name, username)
+                    user = db.create_user(chat_id, 'telegram', full_name, username)
                     response_text = TelegramService.format_name_registered_message(full_name)
                     telegram_service.send_message(chat_id, response_text)
                 else:
@@ -264,19 +352,16 @@ def process_telegram_message(chat_id: str, text: str, username: str = None, full
 
             # User is registered - process message with AI
             # Get user's AI backend preference
-            user = db.get_user(chat_id, 'telegram')
-            ai_backend = user.get('ai_backend', 'openrouter') if user else 'openrouter'
+            ai_backend = user.get('ai_backend', 'openrouter')
 
-            # Get conversation history
-            conversation_history = db.get_conversation_history_formatted(
+            # Save user message and get the conversation history before it
+            conversation_history = db.append_user_and_fetch_history(
                 chat_id,
                 'telegram',
+                text,
                 limit=5
             )
 
-            # Save user message
-            db.add_conversation_message(chat_id, 'telegram', 'user', text)
-
             # Send "typing" indicator (optional - requires webhook mode)
             # telegram_service.send_chat_action(chat_id, 'typing')
 
@@ -284,11 +369,16 @@ def process_telegram_message(chat_id: str, text: str, username: str = None, full
             ai_response = get_llm_response(text, conversation_history, backend=ai_backend)
 
             if ai_response:
-                # Save AI response
-                db.add_conversation_message(chat_id, 'telegram', 'assistant', ai_response)
+                # Save AI response while it is being sent
+                saved = history_write_pool.submit(
+                    db.add_conversation_message, chat_id, 'telegram', 'assistant', ai_response
+                )
 
                 # Send response to user
                 telegram_service.send_message(chat_id, ai_response, parse_mode=None)
+
+                # Finish the write before this chat's next message reads history
+                saved.result()
             else:
                 # AI failed - send error message
                 error_msg = TelegramService.format_error_message()
@@ -306,6 +396,133 @@ def process_telegram_message(chat_id: str, text: str, username: str = None, full
             pass
 
 
+def set_user_name(chat_id: str, name: str, username: str = None):
+    """Register the user under name, or rename them if already registered"""
+    # Check if user exists
+    user = db.get_user(chat_id, 'telegram')
+
+    if user:
+        # Update existing name
+        db.update_user_name(chat_id, name, 'telegram')
+        response_text = TelegramService.format_name_updated_message(name)
+    else:
+        # Create new user
+        db.create_user(chat_id, 'telegram', name, username)
+        response_text = TelegramService.format_name_registered_message(name)
+
+    telegram_service.send_message(chat_id, response_text)
+
+
+def _cmd_start(chat_id: str, command: str, username: str = None, full_name: str = None):
+    # Check if user exists
+    user = db.get_user(chat_id, 'telegram')
+
+    if user and user['name']:
+        response = TelegramService.format_welcome_message(user['name'])
+    else:
+        # Auto-register with Telegram name if available
+        if full_name:
+            db.create_user(chat_id, 'telegram', full_name, username)
+            response = TelegramService.format_name_registered_message(full_name)
+        else:
+            response = TelegramService.format_welcome_message()
+
+    telegram_service.send_message(chat_id, response)
+
+
+def _cmd_help(chat_id: str, command: str, username: str = None, full_name: str = None):
+    response = TelegramService.format_help_message()
+    telegram_service.send_message(chat_id, response)
+
+
+def _cmd_clear(chat_id: str, command: str, username: str = None, full_name: str = None):
+    db.clear_conversation_history(chat_id, 'telegram')
+    response = TelegramService.format_history_cleared_message()
+    telegram_service.send_message(chat_id, response)
+
+
+def _cmd_setname(chat_id: str, command: str, username: str = None, full_name: str = None):
+    name = TelegramService.parse_name_command(command)
+
+    if not name:
+        telegram_service.send_message(
+            chat_id,
+            "Please provide a valid name. Use: `/setname <your name>`"
+        )
+        return
+
+    set_user_name(chat_id, name, username)
+
+
+def _cmd_openrouter(chat_id: str, command: str, username: str = None, full_name: str = None):
+    # Switch to OpenRouter AI
+    user = db.get_user(chat_id, 'telegram')
+    if user:
+        db.update_user_ai_backend(chat_id, 'openrouter', 'telegram')
+        response = (
+            "✅ *Switched to OpenRouter AI*\n\n"
+            "You're now chatting with OpenRouter's AI models (cloud-based, advanced).\n\n"
+            "Use `/cerebrum` to switch to the local CEREBRUM AI."
+        )
+    else:
+        response = "Please use /start first to register."
+    telegram_service.send_message(chat_id, response)
+
+
+def _cmd_cerebrum(chat_id: str, command: str, username: str = None, full_name: str = None):
+    # Switch to CEREBRUM AI
+    user = db.get_user(chat_id, 'telegram')
+    if user:
+        db.update_user_ai_backend(chat_id, 'cerebrum', 'telegram')
+        response = (
+            "✅ *Switched to CEREBRUM AI*\n\n"
+            "You're now chatting with CEREBRUM, a novel AGI system running locally.\n"
+            "CEREBRUM is currently learning language and may give shorter responses.\n\n"
+            "Use `/openrouter` to switch back to OpenRouter AI."
+        )
+    else:
+        response = "Please use /start first to register."
+    telegram_service.send_message(chat_id, response)
+
+
+def _cmd_status(chat_id: str, command: str, username: str = None, full_name: str = None):
+    # Show current AI backend
+    user = db.get_user(chat_id, 'telegram')
+    if user:
+        current_ai = user.get('ai_backend', 'openrouter')
+        ai_name = "OpenRouter AI" if current_ai == 'openrouter' else "CEREBRUM AI"
+        response = (
+            f"🤖 *Current AI Backend*\n\n"
+            f"You're chatting with: *{ai_name}*\n\n"
+            f"*Available AIs:*\n"
+            f"• `/openrouter` - Cloud-based advanced AI\n"
+            f"• `/cerebrum` - Local novel AGI system\n\n"
+            f"Use these commands to switch between them."
+        )
+    else:
+        response = "Please use /start first to register."
+    telegram_service.send_message(chat_id, response)
+
+
+def _cmd_unknown(chat_id: str, command: str, username: str = None, full_name: str = None):
+    telegram_service.send_message(
+        chat_id,
+        f"Unknown command. Use /help to see available commands."
+    )
+
+
+# Command verb -> handler(chat_id, command, username, full_name)
+COMMANDS = {
+    '/start': _cmd_start,
+    '/help': _cmd_help,
+    '/clear': _cmd_clear,
+    '/setname': _cmd_setname,
+    '/openrouter': _cmd_openrouter,
+    '/cerebrum': _cmd_cerebrum,
+    '/status': _cmd_status,
+}
+
+
 def handle_command(chat_id: str, command: str, username: str = None, full_name: str = None):
     """
     Handle bot commands
@@ -316,89 +533,11 @@ def handle_command(chat_id: str, command: str, username: str = None, full_name:
         username: Telegram username
         full_name: User's full name
     """
-    command_lower = command.lower().strip()
+    # First word only, minus any "@BotName" suffix Telegram adds in groups
+    verb = command.split(None, 1)[0].split('@', 1)[0].lower()
 
-    if command_lower == '/start':
-        # Check if user exists
-        user = db.get_user(chat_id, 'telegram')
-
-        if user and user['name']:
-            response = TelegramService.format_welcome_message(user['name'])
-        else:
-            # Auto-register with Telegram name if available
-            if full_name:
-                db.create_user(chat_id, 'telegram', full_name, username)
-                response = TelegramService.format_name_registered_message(full_name)
-            else:
-                response = TelegramService.format_welcome_message()
-
-        telegram_service.send_message(chat_id, response)
-
-    elif command_lower == '/help':
-        response = TelegramService.format_help_message()
-        telegram_service.send_message(chat_id, response)
-
-    elif command_lower == '/clear':
-        count = db.clear_conversation_history(chat_id, 'telegram')
-        response = TelegramService.format_history_cleared_message()
-        telegram_service.send_message(chat_id, response)
-
-    elif command_lower.startswith('/setname'):
-        # Let process_telegram_message handle it
-        process_telegram_message(chat_id, command, username, full_name)
-
-    elif command_lower == '/openrouter':
-        # Switch to OpenRouter AI
-        user = db.get_user(chat_id, 'telegram')
-        if user:
-            db.update_user_ai_backend(chat_id, 'openrouter', 'telegram')
-            response = (
-                "✅ *Switched to OpenRouter AI*\n\n"
-                "You're now chatting with OpenRouter's AI models (cloud-based, advanced).\n\n"
-                "Use `/cerebrum` to switch to the local CEREBRUM AI."
-            )
-        else:
-            response = "Please use /start first to register."
-        telegram_service.send_message(chat_id, response)
-
-    elif command_lower == '/cerebrum':
-        # Switch to CEREBRUM AI
-        user = db.get_user(chat_id, 'telegram')
-        if user:
-            db.update_user_ai_backend(chat_id, 'cerebrum', 'telegram')
-            response = (
-                "✅ *Switched to CEREBRUM AI*\n\n"
-                "You're now chatting with CEREBRUM, a novel AGI system running locally.\n"
-                "CEREBRUM is currently learning language and may give shorter responses.\n\n"
-                "Use `/openrouter` to switch back to OpenRouter AI."
-            )
-        else:
-            response = "Please use /start first to register."
-        telegram_service.send_message(chat_id, response)
-
-    elif command_lower == '/status':
-        # Show current AI backend
-        user = db.get_user(chat_id, 'telegram')
-        if user:
-            current_ai = user.get('ai_backend', 'openrouter')
-            ai_name = "OpenRouter AI" if current_ai == 'openrouter' else "CEREBRUM AI"
-            response = (
-                f"🤖 *Current AI Backend*\n\n"
-                f"You're chatting with: *{ai_name}*\n\n"
-                f"*Available AIs:*\n"
-                f"• `/openrouter` - Cloud-based advanced AI\n"
-                f"• `/cerebrum` - Local novel AGI system\n\n"
-                f"Use these commands to switch between them."
-            )
-        else:
-            response = "Please use /start first to register."
-        telegram_service.send_message(chat_id, response)
-
-    else:
-        telegram_service.send_message(
-            chat_id,
-            f"Unknown command. Use /help to see available commands."
-        )
+    handler = COMMANDS.get(verb, _cmd_unknown)
+    handler(chat_id, command, username, full_name)
 
 
 @app.on_event("startup")
@@ -411,6 +550,15 @@ async def startup_event():
         logger.warning(f"{CROSS} Telegram Service initialization failed - check bot token")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop accepting new work; in-flight messages finish in the background"""
+    global polling_active
+    polling_active = False
+    message_pool.shutdown(wait=False)
+    history_write_pool.shutdown(wait=False)
+
+
 @app.get("/")
 async def health_check():
     """Health check endpoint"""
@@ -440,10 +588,10 @@ async def telegram_webhook(request: Request):
     """
     if not telegram_service:
         logger.error("Telegram service not initialized")
-        return JSONResponse({"ok": True})
+        return Response(WEBHOOK_OK, media_type="application/json")
 
     try:
-        update = await request.json()
+        update = json_loads(await request.body())
         logger.debug(f"Received webhook update: {update}")
 
         # Extract message data
@@ -451,22 +599,19 @@ async def telegram_webhook(request: Request):
 
         if msg_data and msg_data['text']:
             # Process message in background
-            threading.Thread(
-                target=process_telegram_message,
-                args=(
-                    msg_data['chat_id'],
-                    msg_data['text'],
-                    msg_data.get('username'),
-                    msg_data.get('full_name')
-                ),
-                daemon=True
-            ).start()
+            message_pool.submit(
+                process_telegram_message,
+                msg_data['chat_id'],
+                msg_data['text'],
+                msg_data.get('username'),
+                msg_data.get('full_name')
+            )
 
     except Exception as e:
         logger.error(f"Error processing webhook: {e}", exc_info=True)
 
     # Always return OK to Telegram
-    return JSONResponse({"ok": True})
+    return Response(WEBHOOK_OK, media_type="application/json")
 
 
 @app.get("/telegram/status")
@@ -542,35 +687,60 @@ def polling_loop():
     """Main polling loop for receiving updates"""
     logger.info("Starting polling loop...")
     offset = None
+    backoff = POLL_BACKOFF_MIN
 
     while polling_active:
         try:
             updates = telegram_service.get_updates(offset=offset, timeout=30)
 
+            if updates is None:
+                # Telegram unreachable or erroring - back off with jitter so
+                # a recovering API isn't hit at a fixed rate
+                time.sleep(backoff * (0.5 + random.random()))
+                backoff = min(POLL_BACKOFF_MAX, backoff * 2)
+                continue
+            backoff = POLL_BACKOFF_MIN
+
+            # Advance the offset past the whole batch before dispatching, so
+            # Telegram never re-delivers updates that are already queued
+            by_chat = {}
             for update in updates:
-                # Update offset
                 update_id = update.get('update_id')
                 if update_id:
                     offset = update_id + 1
 
-                # Extract and process message
                 msg_data = TelegramService.extract_message_data(update)
-
                 if msg_data and msg_data['text']:
-                    process_telegram_message(
-                        msg_data['chat_id'],
-                        msg_data['text'],
-                        msg_data.get('username'),
-                        msg_data.get('full_name')
-                    )
+                    by_chat.setdefault(msg_data['chat_id'], []).append(msg_data)
+
+            # Chats are processed in parallel; each chat's messages stay in
+            # order so its conversation history is not interleaved. The batch
+            # finishes before the next poll, so a chat's messages from two
+            # batches never run at once and a burst can't pile up unbounded
+            wait([
+                message_pool.submit(process_chat_messages, messages)
+                for messages in by_chat.values()
+            ])
 
         except Exception as e:
             logger.error(f"Error in polling loop: {e}")
-            time.sleep(5)  # Wait before retrying
+            time.sleep(backoff * (0.5 + random.random()))
+            backoff = min(POLL_BACKOFF_MAX, backoff * 2)
 
     logger.info("Polling loop stopped")
 
 
+def process_chat_messages(messages: list):
+    """Process one chat's messages from a polling batch, in arrival order"""
+    for msg_data in messages:
+        process_telegram_message(
+            msg_data['chat_id'],
+            msg_data['text'],
+            msg_data.get('username'),
+            msg_data.get('full_name')
+        )
+
+
 def run_server(host: str = "0.0.0.0", port: int = 8041, use_polling: bool = True):
     """
     Run the Telegram bot server
@@ -590,7 +760,7 @@ def run_server(host: str = "0.0.0.0", port: int = 8041, use_polling: bool = True
     print("", flush=True)
 
     # Check if bot token is configured
-    if not (os.getenv('TELEGRAM_BOT_TOKEN') or config.get('telegram_bot_token')):
+    if not BOT_TOKEN:
         print(f"{CROSS} WARNING: Telegram bot token not configured!", flush=True)
         print("  Set environment variable or add to config.json:", flush=True)
         print("  - TELEGRAM_BOT_TOKEN", flush=True)
@@ -622,10 +792,22 @@ def run_server(host: str = "0.0.0.0", port: int = 8041, use_polling: bool = True
     print("", flush=True)
     print(f"{CHECK} Starting server...", flush=True)
 
+    # Prefer uvloop + httptools when installed (uvloop is unavailable on Windows)
+    loop = 'uvloop' if importlib.util.find_spec('uvloop') else 'asyncio'
+    http = 'httptools' if importlib.util.find_spec('httptools') else 'h11'
+
+    # Polling state (polling_active/polling_thread) lives in this process, so
+    # polling mode always runs one worker. Webhook mode can opt into more;
+    # each worker then keeps its own response cache (the user cache is off)
+    workers = 1 if use_polling else WEBHOOK_WORKERS
+
     uvicorn.run(
-        app,
+        "telegram_server:app" if workers > 1 else app,
         host=host,
         port=port,
+        loop=loop,
+        http=http,
+        workers=workers,
         log_level="info"
     )
 
@@ -11,25 +11,49 @@ Handles Telegram messaging via Bot API:
 """
 
 import re
+import json
 import logging
 from typing import Optional, Dict, Any
 import requests
 
+try:
+    import orjson
+except ImportError:  # Optional - falls back to the stdlib json module
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a Bot API payload, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    """Parse a Bot API response body, with orjson when it is installed"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 
 class TelegramService:
     """Handles Telegram operations via Bot API"""
 
-    def __init__(self, bot_token: str):
+    def __init__(self, bot_token: str, session: Optional[requests.Session] = None):
         """
         Initialize Telegram Bot
 
         Args:
             bot_token: Telegram bot token from @BotFather
+            session: HTTP session to reuse (one is created if omitted)
         """
         self.bot_token = bot_token
         self.api_url = f"https://api.telegram.org/bot{bot_token}"
+        # Every Bot API call goes through one keep-alive session, so they share
+        # a single TLS connection to api.telegram.org
+        self.session = session or requests.Session()
         logger.info("Telegram Service initialized")
 
     def send_message(
@@ -82,7 +106,9 @@ class TelegramService:
             if parse_mode:
                 payload["parse_mode"] = parse_mode
 
-            response = requests.post(url, json=payload, timeout=10)
+            response = self.session.post(
+                url, data=_dumps(payload), headers=JSON_HEADERS, timeout=10
+            )
 
             if response.status_code == 200:
                 logger.info(f"Message sent to {chat_id}")
@@ -104,7 +130,7 @@ class TelegramService:
         """
         try:
             url = f"{self.api_url}/getMe"
-            response = requests.get(url, timeout=5)
+            response = self.session.get(url, timeout=5)
 
             if response.status_code == 200:
                 data = response.json()
@@ -131,7 +157,7 @@ class TelegramService:
             url = f"{self.api_url}/setWebhook"
             payload = {"url": webhook_url}
 
-            response = requests.post(url, json=payload, timeout=10)
+            response = self.session.post(url, json=payload, timeout=10)
 
             if response.status_code == 200:
                 data = response.json()
@@ -155,7 +181,7 @@ class TelegramService:
         """
         try:
             url = f"{self.api_url}/deleteWebhook"
-            response = requests.post(url, timeout=5)
+            response = self.session.post(url, timeout=5)
 
             if response.status_code == 200:
                 data = response.json()
@@ -169,7 +195,7 @@ class TelegramService:
             logger.error(f"Error deleting webhook: {e}")
             return False
 
-    def get_updates(self, offset: int = None, timeout: int = 30) -> list:
+    def get_updates(self, offset: int = None, timeout: int = 30) -> Optional[list]:
         """
         Get updates (polling mode)
 
@@ -178,7 +204,8 @@ class TelegramService:
             timeout: Long polling timeout
 
         Returns:
-            List of updates
+            List of updates (empty if the long poll timed out), or None if
+            the request failed
         """
         try:
             url = f"{self.api_url}/getUpdates"
@@ -187,18 +214,19 @@ class TelegramService:
             if offset:
                 params["offset"] = offset
 
-            response = requests.get(url, params=params, timeout=timeout + 5)
+            response = self.session.get(url, params=params, timeout=timeout + 5)
 
             if response.status_code == 200:
-                data = response.json()
+                data = _loads(response.content)
                 if data.get('ok'):
                     return data.get('result', [])
 
-            return []
+            logger.error(f"getUpdates returned {response.status_code}: {response.text}")
+            return None
 
         except Exception as e:
             logger.error(f"Error getting updates: {e}")
-            return []
+            return None
 
     @staticmethod
     def parse_name_command(message: str) -> Optional[str]:
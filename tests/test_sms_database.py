@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the SMS database schema migration
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sms_database import SMSDatabase
+
+
+class TimestampMigrationTest(unittest.TestCase):
+    """Version 0 ISO TEXT timestamps must survive the integer migration exactly"""
+
+    TIMESTAMPS = ["2024-01-02T03:04:05", "2024-01-02T03:04:05.123456"]
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "sms_users.db")
+
+        # Version 0 schema, as written by the original datetime.now().isoformat() code
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript("""
+            CREATE TABLE users (
+                phone_number TEXT PRIMARY KEY,
+                name TEXT,
+                created_at TEXT,
+                updated_at TEXT
+            );
+            CREATE TABLE conversations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                phone_number TEXT NOT NULL,
+                role TEXT NOT NULL,
+                message TEXT NOT NULL,
+                timestamp TEXT
+            );
+        """)
+        conn.execute(
+            "INSERT INTO users VALUES (?, ?, ?, ?)",
+            ("+15550100", "Ada", self.TIMESTAMPS[0], self.TIMESTAMPS[1])
+        )
+        conn.executemany(
+            "INSERT INTO conversations (phone_number, role, message, timestamp) VALUES (?, ?, ?, ?)",
+            [("+15550100", "user", f"message {i}", ts) for i, ts in enumerate(self.TIMESTAMPS)]
+        )
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_timestamps_round_trip_exactly(self):
+        db = SMSDatabase(self.db_path)
+        try:
+            user = db.get_user("+15550100")
+            history = db.get_conversation_history("+15550100")
+        finally:
+            db.close()
+
+        self.assertEqual(user['created_at'], self.TIMESTAMPS[0])
+        self.assertEqual(user['updated_at'], self.TIMESTAMPS[1])
+        self.assertEqual([m['timestamp'] for m in history], self.TIMESTAMPS)
+
+    def test_unparseable_timestamp_becomes_epoch(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("UPDATE conversations SET timestamp = 'not a date' WHERE id = 1")
+        conn.commit()
+        conn.close()
+
+        db = SMSDatabase(self.db_path)
+        db.close()
+
+        conn = sqlite3.connect(self.db_path)
+        stored = conn.execute("SELECT timestamp FROM conversations WHERE id = 1").fetchone()[0]
+        conn.close()
+        self.assertEqual(stored, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()